@@ -1,5 +1,6 @@
 import os
 import csv
+import itertools
 import datetime
 import subprocess
 import importlib, importlib.util, sys
@@ -7,6 +8,11 @@ import shutil
 from pathlib import Path
 import re
 import json
+import hashlib
+import sqlite3
+from types import MappingProxyType
+
+import numpy as np
 
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QLineEdit,
@@ -14,22 +20,635 @@ from PyQt5.QtWidgets import (
     QPushButton, QComboBox,
     QTextEdit, QGroupBox,
     QFormLayout, QFileDialog,
-    QSizePolicy
+    QSizePolicy, QStackedWidget,
+    QDialog, QTableWidget, QTableWidgetItem
 )
+from PyQt5.QtCore import QTimer, QLocale, QSignalBlocker
+from PyQt5.QtGui import QDoubleValidator, QIntValidator
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
 scatmech_bin = str(Path.home() / "Local/ME498/SCATMECH")
 os.environ["PATH"] = scatmech_bin + os.pathsep + os.environ.get("PATH", "")
 
+# Directory of this module; one of the places brdfplot.py is looked up
+_HERE = Path(__file__).resolve().parent
+
+# Index of completed runs, kept next to the run files in the data directory
+_RUN_INDEX_NAME = ".runs.sqlite3"
+# Characters shown by the input-deck viewer
+_INPUT_VIEW_LIMIT = 2_000_000
+
+# Model Type entries per family, matching the NIST SCATMECH class list
+_SUBCLASSES = MappingProxyType({
+    # --- Roughness models
+    "Roughness_BRDF_Model": (
+        "Microroughness_BRDF_Model",
+        "Correlated_Roughness_BRDF_Model",
+        "Two_Face_BRDF_Model",
+        "Roughness_Stack_BRDF_Model",
+        "Correlated_Roughness_Stack_BRDF_Model",
+        "Uncorrelated_Roughness_Stack_BRDF_Model",
+        "Growth_Roughness_Stack_BRDF_Model",
+    ),
+    # --- Facet models
+    "Facet_BRDF_Model": (
+        "Shadowed_Facet_BRDF_Model",
+        "Subsurface_Facet_BRDF_Model",
+    ),
+    # --- Lambertian
+    "Lambertian_BRDF_Model": (
+        "Diffuse_Subsurface_BRDF_Model",
+    ),
+    # --- Local particle / defect models
+    "Local_BRDF_Model": (
+        "Rayleigh_Defect_BRDF_Model",
+        "OneLayer_BRDF_Model",
+        "Rayleigh_Stack_BRDF_Model",
+        "Double_Interaction_BRDF_Model",
+        "Subsurface_Particle_BRDF_Model",
+        "Bobbert_Vlieger_BRDF_Model",
+        "Axisymmetric_Particle_BRDF_Model",
+        "Subsurface_Bobbert_Vlieger_BRDF_Model",
+        "Subsurface_Axisymmetric_Particle_BRDF_Model",
+    ),
+    # --- Instrument / measurement models
+    "Instrument_BRDF_Model": (
+        "Rayleigh_Instrument_BRDF_Model",
+        "Finite_Aperture_Instrument_BRDF_Model",
+        "Focussed_Beam_Instrument_BRDF_Model",
+    ),
+})
+
+# ---- Parameter specifications scraped from NIST docs
+_MODEL_PARAM_SPECS = MappingProxyType({
+    # Roughness family
+    "Microroughness_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
+    ),
+    "Correlated_Roughness_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
+        ("film","dielectric_function","(1.46,0.05)"),
+        ("thickness","double","0.05"),
+    ),
+    "Two_Face_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
+        ("film","dielectric_function","(1.46,0)"),
+        ("thickness","double","0.05"),
+        ("face","int","1"),
+    ),
+    "Roughness_Stack_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("this_layer","int","0"),
+    ),
+    "Correlated_Roughness_Stack_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+    ),
+    "Uncorrelated_Roughness_Stack_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+    ),
+    "Growth_Roughness_Stack_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("intrinsic","PSD_Function_Ptr","ABC_PSD_Function"),
+        ("relaxation","double","0.05"),
+        ("exponent","double","2"),
+    ),
+    # Facet family
+    "Shadowed_Facet_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("sdf","Slope_Distribution_Function","Exponential_Slope_Distribution_Function"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("shadow","Shadow_Function","Torrance_Sparrow_Shadow_Function"),
+    ),
+    "Subsurface_Facet_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("sdf","Slope_Distribution_Function","Exponential_Slope_Distribution_Function"),
+    ),
+    # Lambertian
+    "Lambertian_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("reflectance","Reflectance","Table_Reflectance"),
+    ),
+    "Diffuse_Subsurface_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("reflectance","Reflectance","Table_Reflectance"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+    ),
+    # Local / defect
+    "Rayleigh_Defect_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("density","double","1"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("radius","double","0.001"),
+        ("distance","double","0"),
+        ("defect","dielectric_function","(1.0,0.0)"),
+    ),
+    "OneLayer_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("density","double","1"),
+        ("radius","double","0.01"),
+        ("defect","dielectric_function","(1.0,0.0)"),
+        ("film","dielectric_function","(1.59,0.0)"),
+        ("tau","double","0.05"),
+        ("depth","double","0.00"),
+    ),
+    "Rayleigh_Stack_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("density","double","1"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("radius","double","0.01"),
+        ("sphere","dielectric_function","(1,0)"),
+        ("depth","double","0"),
+    ),
+    "Double_Interaction_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("density","double","1"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("distance","double","0.05"),
+        ("scatterer","Free_Space_Scatterer_Ptr","MieScatterer"),
+        ("alpha","double","0"),
+        ("beta","double","0"),
+    ),
+    "Subsurface_Particle_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("density","double","1"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("depth","double","0"),
+        ("scatterer","Free_Space_Scatterer_Ptr","MieScatterer"),
+        ("alpha","double","0"),
+        ("beta","double","0"),
+    ),
+    "Bobbert_Vlieger_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("density","double","1"),
+        ("sphere","dielectric_function","(1.59,0)"),
+        ("radius","double","0.05"),
+        ("spherecoat","StackModel_Ptr","No_StackModel"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("delta","double","0"),
+        ("lmax","int","0"),
+        ("order","int","-1"),
+        ("Norm_Inc_Approx","int","0"),
+    ),
+    "Axisymmetric_Particle_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("density","double","1"),
+        ("Shape","Axisymmetric_Shape","Ellipsoid_Axisymmetric_Shape"),
+        ("particle","dielectric_function","(1.59,0)"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("delta","double","0"),
+        ("lmax","int","0"),
+        ("nmax","int","0"),
+        ("order","int","-1"),
+        ("Norm_Inc_Approx","int","0"),
+        ("improve","int","3"),
+    ),
+    "Subsurface_Bobbert_Vlieger_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("density","double","1"),
+        ("sphere","dielectric_function","(1.59,0)"),
+        ("radius","double","0.05"),
+        ("spherecoat","StackModel_Ptr","No_StackModel"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("delta","double","0"),
+        ("lmax","int","0"),
+        ("order","int","-1"),
+        ("Norm_Inc_Approx","int","0"),
+        ("improve","int","3"),
+    ),
+    "Subsurface_Axisymmetric_Particle_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("density","double","1"),
+        ("Shape","Axisymmetric_Shape","Ellipsoid_Axisymmetric_Shape"),
+        ("particle","dielectric_function","(1.59,0)"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("delta","double","0"),
+        ("lmax","int","0"),
+        ("nmax","int","0"),
+        ("order","int","-1"),
+        ("Norm_Inc_Approx","int","0"),
+        ("improve","int","3"),
+    ),
+    # Instrument
+    "Rayleigh_Instrument_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("field_of_view","double","1000"),
+        ("air","dielectric_function","(1+2784E-7,0)"),
+        ("number_density","double","2.51E-7"),
+    ),
+    "Finite_Aperture_Instrument_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("alpha","double","0"),
+        ("integralmode","int","3"),
+        ("model","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+    ),
+    "Focussed_Beam_Instrument_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("model","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+        ("alpha","double","0"),
+        ("integralmode","int","3"),
+        ("focal_point","double","1"),
+    ),
+    # Utilities
+    "First_Diffuse_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("depoll","double","0"),
+        ("depolc","double","0"),
+        ("phase_function","Polarized_Phase_Function_Ptr","Unpolarized_Phase_Function"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+    ),
+    "Two_Source_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("factor1","double","1"),
+        ("source1","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+        ("factor2","double","1"),
+        ("source2","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+        ("correlation","double","0"),
+    ),
+    "Three_Source_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("factor1","double","1"),
+        ("source1","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+        ("factor2","double","1"),
+        ("source2","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+        ("factor3","double","1"),
+        ("source3","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+    ),
+    "Four_Source_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("factor1","double","1"),
+        ("source1","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+        ("factor2","double","1"),
+        ("source2","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+        ("factor3","double","1"),
+        ("source3","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+        ("factor4","double","1"),
+        ("source4","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+    ),
+    "Transmit_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("model","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
+        ("films","StackModel_Ptr","No_StackModel"),
+    ),
+    "RCW_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("alpha","double","0.0175"),
+        ("order","int","25"),
+        ("grating","Grating_Ptr","Single_Line_Grating"),
+    ),
+    "CrossRCW_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("alpha","double","0.0175"),
+        ("RCW","CrossRCW_Model_Ptr","CrossRCW_Model"),
+    ),
+    "ZernikeExpansion_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("coefficientfile","string",""),
+        ("scale","Table","1"),
+    ),
+    "Polydisperse_Sphere_BRDF_Model": (
+        ("lambda","double","0.532"),
+        ("type","int","0"),
+        ("substrate","dielectric_function","(4.05,0.05)"),
+        ("distribution","SurfaceParticleSizeDistribution","SurfaceParticleSizeDistribution"),
+        ("stack","StackModel_Ptr","No_StackModel"),
+        ("particle","dielectric_function","(1.5,0.0)"),
+        ("Dstart","double","0.1"),
+        ("Dend","double","100"),
+        ("Dstep","double","0.01"),
+        ("fractional_coverage","double","0"),
+        ("antirainbow","double","0"),
+    ),
+})
+
+# Rows shown in the model parameter form, with their labels; the PSD pointer
+# is configured in the dedicated PSD section instead
+_MODEL_SPECS_UI = MappingProxyType({
+    model: tuple(
+        (sys.intern(name), dtype, sys.intern(default), f"{name} ({dtype}):")
+        for name, dtype, default in specs
+        if name.lower() != "psd" and dtype != "PSD_Function_Ptr"
+    )
+    for model, specs in _MODEL_PARAM_SPECS.items()
+})
+
+
+# Token classification for brdfprog output; Fortran writes exponents as 1.0D-03
+_ALPHA = re.compile(r"[A-Za-z]")
+_LETTERS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
+# A single numeric token as float() would accept it, Fortran D exponents included
+_NUM = re.compile(
+    r"[-+]?(?:(?:\d+\.?\d*|\.\d+)(?:[EeDd][-+]?\d+)?|nan|inf(?:inity)?)\Z",
+    re.IGNORECASE,
+)
+# First characters a numeric row can start with (n/i cover nan and inf);
+# lines starting with anything else are text without attempting float()
+_NUM_STARTS = frozenset("0123456789+-.,nNiI")
+# D exponents to E and commas to blanks, so str.split() tokenises a row
+_NUMERIC_LINE_FIX = str.maketrans({"D": "E", "d": "E", ",": " "})
+
+
+def _numeric_output_to_csv(text, csv_path):
+    """Write the numeric rows of brdfprog stdout to csv_path.
+
+    Returns (column_count, header_tokens); column_count is 0 and nothing is
+    written when no numeric rows are found. The header is the last text line
+    before the first numeric row. The trailing numeric block is parsed in one
+    np.loadtxt call; anything it rejects (ragged rows, interleaved text) goes
+    through the line-by-line parser instead.
+    """
+    lines = text.splitlines()
+    header_tokens = []
+    start = None
+    for i, raw_line in enumerate(lines):
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        tokens = line.replace(",", " ").split()
+        if not tokens:
+            continue
+        if line[0] in _NUM_STARTS and _NUM.match(tokens[0]):
+            start = i
+            break
+        header_tokens = tokens
+    if start is None:
+        return 0, header_tokens
+
+    block = [
+        line.translate(_NUMERIC_LINE_FIX) for line in lines[start:]
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+    try:
+        table = np.loadtxt(block, ndmin=2, comments=None)
+    except ValueError:
+        table = None
+    if table is not None and table.size:
+        np.savetxt(csv_path, table, delimiter=",", fmt="%s")
+        return table.shape[1], header_tokens
+
+    # Rows are written as they are parsed; the CSV is only created once the
+    # first numeric row turns up.
+    column_count = 0
+    header_tokens = []
+    last_text_tokens = []
+    csvfile = writer = None
+    try:
+        for raw_line in lines:
+            line = raw_line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line[0] not in _NUM_STARTS:
+                last_text_tokens = line.replace(",", " ").split()
+                continue
+            try:
+                row = list(map(float, line.translate(_NUMERIC_LINE_FIX).split()))
+            except ValueError:
+                last_text_tokens = line.replace(",", " ").split()
+                continue
+            if row:
+                if writer is None:
+                    csvfile = open(csv_path, "w", newline="", encoding="utf-8")
+                    writer = csv.writer(csvfile)
+                writer.writerow(row)
+                column_count = max(column_count, len(row))
+                if not header_tokens and last_text_tokens:
+                    header_tokens = list(last_text_tokens)
+    finally:
+        if csvfile is not None:
+            csvfile.close()
+
+    if not header_tokens and last_text_tokens:
+        header_tokens = list(last_text_tokens)
+    return column_count, header_tokens
+
+
+def _newest_files(data_dir, prefix, suffixes):
+    """Return {suffix: path} of the most recently modified prefix*suffix files."""
+    newest = {}
+    try:
+        with os.scandir(data_dir) as it:
+            for entry in it:
+                name = entry.name
+                if not name.startswith(prefix):
+                    continue
+                for suffix in suffixes:
+                    if name.endswith(suffix):
+                        mtime = entry.stat().st_mtime
+                        if suffix not in newest or mtime > newest[suffix][0]:
+                            newest[suffix] = (mtime, entry.path)
+                        break
+    except OSError:
+        return {}
+    return {suffix: path for suffix, (_mtime, path) in newest.items()}
+
+
+def _pad_rows(rows):
+    """Return ragged token rows as a 2D object array padded with ""."""
+    lens = np.fromiter(map(len, rows), dtype=np.intp, count=len(rows))
+    table = np.full((len(rows), int(lens.max())), "", dtype=object)
+    table[np.arange(table.shape[1]) < lens[:, None]] = np.fromiter(
+        itertools.chain.from_iterable(rows), dtype=object, count=int(lens.sum()))
+    return table
+
+
 class BRDFForm(QWidget):
 
-    DIRECTION_CODES = {
+    DIRECTION_CODES = MappingProxyType({
         "Forward Reflection": "0",
         "Forward Transmission": "1",
         "Backward Reflection": "2",
         "Backward Transmission": "3",
-    }
+    })
+
+    MODEL_PARAM_SPECS = _MODEL_PARAM_SPECS
+
+    # Menu letters brdfprog expects for each family / roughness model / PSD
+    MODEL_FAMILY_MAP = MappingProxyType({
+        "Roughness_BRDF_Model": "A",
+        "Facet_BRDF_Model": "B",
+        "Lambertian_BRDF_Model": "C",
+        "Local_BRDF_Model": "D",
+        "Instrument_BRDF_Model": "E",
+        "First_Diffuse_BRDF_Model": "F",
+        "Two_Source_BRDF_Model": "G",
+        "Three_Source_BRDF_Model": "H",
+        "Four_Source_BRDF_Model": "I",
+        "Transmit_BRDF_Model": "J",
+        "RCW_BRDF_Model": "K",
+        "CrossRCW_BRDF_Model": "L",
+        "ZernikeExpansion_BRDF_Model": "M",
+        "Polydisperse_Sphere_BRDF_Model": "N",
+    })
+    SUBCLASS_MAP = MappingProxyType({
+        "Microroughness_BRDF_Model": "A",
+        "Correlated_Roughness_BRDF_Model": "B",
+        "Roughness_Stack_BRDF_Model": "C",
+        "Correlated_Roughness_Stack_BRDF_Model": "D",
+        "Uncorrelated_Roughness_Stack_BRDF_Model": "E",
+        "Growth_Roughness_Stack_BRDF_Model": "F",
+        "Two_Face_BRDF_Model": "G",
+    })
+    PSD_MAP = MappingProxyType({
+        "Unit_PSD_Function": "A",
+        "ABC_PSD_Function": "B",
+        "Table_PSD_Function": "C",
+        "Fractal_PSD_Function": "D",
+        "Gaussian_PSD_Function": "E",
+        "Elliptical_Mesa_PSD_Function": "F",
+        "Rectangular_Mesa_PSD_Function": "G",
+        "Triangular_Mesa_PSD_Function": "H",
+        "Rectangular_Pyramid_PSD_Function": "I",
+        "Triangular_Pyramid_PSD_Function": "J",
+        "Parabolic_Dimple_PSD_Function": "K",
+        "Double_PSD_Function": "L",
+    })
+
+    # JSON key -> widget attribute for each PSD panel, in brdfprog input order
+    PSD_FIELD_MAP = MappingProxyType({
+        "Unit_PSD_Function": {},
+        "ABC_PSD_Function": {"A_um4": "psd_A", "B_um": "psd_B", "C": "psd_C"},
+        "Fractal_PSD_Function": {"A_um4": "psd_fractalAmp", "gamma": "psd_fractalExp"},
+        "Gaussian_PSD_Function": {"sigma_um": "psd_sigma", "Lc_um": "psd_lc"},
+        "Elliptical_Mesa_PSD_Function": {
+            "axisx_um": "psd_ellipticalX", "axisy_um": "psd_ellipticalY",
+            "height_um": "psd_mesaHeight", "density_um^-2": "psd_mesaDensity",
+        },
+        "Rectangular_Mesa_PSD_Function": {
+            "lengthx_um": "psd_rectLenX", "lengthy_um": "psd_rectLenY",
+            "height_um": "psd_rectHeight", "density_um^-2": "psd_rectDensity",
+        },
+        "Triangular_Mesa_PSD_Function": {
+            "side_um": "psd_triSide", "height_um": "psd_triHeight", "density_um^-2": "psd_triDensity",
+        },
+        "Rectangular_Pyramid_PSD_Function": {
+            "lengthx_um": "psd_pyrLenX", "lengthy_um": "psd_pyrLenY",
+            "height_um": "psd_pyrHeight", "density_um^-2": "psd_pyrDensity",
+        },
+        "Triangular_Pyramid_PSD_Function": {
+            "side_um": "psd_tpSide", "height_um": "psd_tpHeight", "density_um^-2": "psd_tpDensity",
+        },
+        "Parabolic_Dimple_PSD_Function": {
+            "axisx_um": "psd_pdAxisX", "axisy_um": "psd_pdAxisY",
+            "height_um": "psd_pdHeight", "density_um^-2": "psd_pdDensity",
+        },
+    })
+
+    # PSD parameter widgets in the order brdfprog reads them
+    PSD_FIELDS = MappingProxyType({
+        psd: tuple(fields.values()) for psd, fields in PSD_FIELD_MAP.items()
+    })
+
+    # JSON key -> widget attribute for the angle and general sections
+    ANGLE_FIELDS = MappingProxyType({
+        "incident_deg": "incident_angle",
+        "scatter_start_deg": "scatter_start",
+        "scatter_end_deg": "scatter_end",
+        "scatter_step_deg": "scatter_step",
+        "azimuth_start_deg": "azimuth_start",
+        "azimuth_end_deg": "azimuth_end",
+        "azimuth_step_deg": "azimuth_step",
+    })
+    GENERAL_FIELDS = MappingProxyType({
+        "wavelength_um": "wavelength",
+        "substrate": "substrate",
+    })
+
+    # Builder method for each PSD parameter panel
+    _PSD_BUILDERS = MappingProxyType({
+        "Unit_PSD_Function": "_build_psd_unit",
+        "ABC_PSD_Function": "_build_psd_abc",
+        "Fractal_PSD_Function": "_build_psd_fractal",
+        "Gaussian_PSD_Function": "_build_psd_gaussian",
+        "Elliptical_Mesa_PSD_Function": "_build_psd_elliptical_mesa",
+        "Rectangular_Mesa_PSD_Function": "_build_psd_rectangular_mesa",
+        "Triangular_Mesa_PSD_Function": "_build_psd_triangular_mesa",
+        "Rectangular_Pyramid_PSD_Function": "_build_psd_rectangular_pyramid",
+        "Triangular_Pyramid_PSD_Function": "_build_psd_triangular_pyramid",
+        "Parabolic_Dimple_PSD_Function": "_build_psd_parabolic_dimple",
+    })
+
+    # (module, how) for the resolved brdfplot, shared by all forms
+    _brdfplot_cache = None
+
+    # (index path, connection) for the run index, shared by all forms
+    _run_db = None
+
+    # Resolved brdfprog executable, shared by all forms
+    _exe_path = None
     
     def __init__(self):
         super().__init__()
@@ -47,6 +666,11 @@ class BRDFForm(QWidget):
         self.figure = Figure(figsize=(6, 5), tight_layout=True)
         self.canvas = FigureCanvas(self.figure)
         self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._bg = None
+        self._bg_signature = None
+        self._blit_artists = []
+        self._ax = None
+        self.canvas.mpl_connect("draw_event", self._on_canvas_draw)
 
         plot_layout = QVBoxLayout()
         plot_layout.addWidget(self.canvas, 1)
@@ -56,6 +680,35 @@ class BRDFForm(QWidget):
         self.main_layout.addWidget(form_widget, 1)
         self.main_layout.addWidget(plot_widget, 1)
 
+        # State for last I/O paths
+        self.last_stdout_path = None
+        self.last_input_path = None
+        self.last_csv_path = None
+        self.last_output_meta = None
+        self._meta_cache = {}
+        # Parameter edits of the model page on show; filled once the form is built
+        self.param_widgets = {}
+        # (digest, csv, stdout, input) of the last run that produced a table
+        self._last_run = None
+        # Pending output_box lines while run_brdfprog is in progress
+        self._log_buffer = None
+        # (DATA dir mtime_ns, newest brdf_input_*.txt) from open_last_input
+        self._last_input_scan = None
+
+        # The form itself is built on first show (see _ensure_built)
+        self._built = False
+
+    def showEvent(self, event):
+        self._ensure_built()
+        super().showEvent(event)
+
+    def _ensure_built(self):
+        if self._built:
+            return
+        self._built = True
+        self._build_form()
+
+    def _build_form(self):
         # ===== Angular parameters =====
         angles_group = QGroupBox("Angular Parameters")
         angle_layout = QFormLayout()
@@ -102,7 +755,8 @@ class BRDFForm(QWidget):
         self.wavelength = QLineEdit("0.532")
         self.substrate = QLineEdit("(4.05,0.05)")
         self.direction = QComboBox()
-        self.direction.addItems(list(self.DIRECTION_CODES.keys()))
+        for label, code in self.DIRECTION_CODES.items():
+            self.direction.addItem(label, code)
 
         param_layout.addRow("Wavelength (µm):", self.wavelength)
         param_layout.addRow("Substrate (n or file):", self.substrate)
@@ -112,12 +766,20 @@ class BRDFForm(QWidget):
 
         # ===== Auto parameters for selected model =====
         self.model_params_group = QGroupBox("Selected Model Parameters")
-        self.model_params_layout = QFormLayout()
-        self.model_params_group.setLayout(self.model_params_layout)
+        model_params_layout = QVBoxLayout()
+        self._params_stack = QStackedWidget()
+        self._params_pages = {}
+        self._current_model = None
+        # One validator per numeric kind, shared by every parameter field
+        self._dval = QDoubleValidator(self)
+        self._dval.setLocale(QLocale.c())
+        self._ival = QIntValidator(self)
+        self._ival.setLocale(QLocale.c())
+        model_params_layout.addWidget(self._params_stack)
+        self.model_params_group.setLayout(model_params_layout)
         self.form_layout.addWidget(self.model_params_group)
         # Populate once the params UI exists
         self.update_subclasses()
-        self.subclass_selector.currentTextChanged.connect(self.populate_model_params)
         self.direction.currentTextChanged.connect(self._on_direction_changed)
 
         # ===== PSD selector and parameter widgets =====
@@ -135,11 +797,57 @@ class BRDFForm(QWidget):
         self.psd_function.currentTextChanged.connect(self.update_psd_parameters)
         psd_layout.addWidget(self.psd_function)
 
-        # --- Unit (no parameters)
+        # Parameter panels are built the first time their PSD is selected
+        # (see _PSD_BUILDERS)
+        self.psd_stack = QStackedWidget()
+        self._psd_index = {}
+        psd_layout.addWidget(self.psd_stack)
+
+        self.psd_group.setLayout(psd_layout)
+        self.form_layout.addWidget(self.psd_group)
+
+        # ===== Controls =====
+        ctrl_row = QHBoxLayout()
+        self.run_btn = QPushButton("Run BRDFProg")
+        self.clear_btn = QPushButton("Clear Plot")
+        ctrl_row.addWidget(self.run_btn)
+        ctrl_row.addWidget(self.clear_btn)
+        self.open_output_btn = QPushButton("Open Last Output")
+        self.open_input_btn = QPushButton("Open Last Input")
+        ctrl_row.addWidget(self.open_output_btn)
+        ctrl_row.addWidget(self.open_input_btn)
+        self.form_layout.addLayout(ctrl_row)
+
+        # Output log
+        self.output_box = QTextEdit()
+        self.output_box.setReadOnly(True)
+        self.form_layout.addWidget(QLabel("Log:"))
+        self.form_layout.addWidget(self.output_box)
+
+        # Wire signals
+        self.run_btn.clicked.connect(self.run_brdfprog)
+        self.clear_btn.clicked.connect(self.clear_plot)
+        self.open_output_btn.clicked.connect(self.open_last_output)
+        self.open_input_btn.clicked.connect(self.open_last_input)
+        
+        # Keep shared parameter fields; keystrokes are coalesced by a short timer
+        self._pending_sync = {}
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(80)
+        self._sync_timer.timeout.connect(self._flush_sync)
+        self.wavelength.textChanged.connect(self._sync_lambda)
+        self.substrate.textChanged.connect(self._sync_substrate)
+
+        # Initialize PSD selector (model selectors were populated above)
+        self.update_psd_parameters(self.psd_function.currentText())
+
+    def _build_psd_unit(self):
         self.psd_param_unit = QWidget()
         self.psd_param_unit.setLayout(QFormLayout())
+        return self.psd_param_unit
 
-        # --- ABC
+    def _build_psd_abc(self):
         self.psd_param_abc = QWidget()
         abc_layout = QFormLayout()
         self.psd_A = QLineEdit("0.01")
@@ -149,8 +857,9 @@ class BRDFForm(QWidget):
         abc_layout.addRow("B [µm]:", self.psd_B)
         abc_layout.addRow("C [-]:", self.psd_C)
         self.psd_param_abc.setLayout(abc_layout)
+        return self.psd_param_abc
 
-        # --- Fractal
+    def _build_psd_fractal(self):
         self.psd_param_fractal = QWidget()
         fractal_layout = QFormLayout()
         self.psd_fractalAmp = QLineEdit("0.01")   # A [µm^4]
@@ -158,8 +867,9 @@ class BRDFForm(QWidget):
         fractal_layout.addRow("Amplitude A [µm⁴]:", self.psd_fractalAmp)
         fractal_layout.addRow("Exponent γ [-]:", self.psd_fractalExp)
         self.psd_param_fractal.setLayout(fractal_layout)
+        return self.psd_param_fractal
 
-        # --- Gaussian
+    def _build_psd_gaussian(self):
         self.psd_param_gaussian = QWidget()
         gaussian_layout = QFormLayout()
         self.psd_sigma = QLineEdit("0.05")
@@ -167,8 +877,9 @@ class BRDFForm(QWidget):
         gaussian_layout.addRow("Std. Dev. σ [µm]:", self.psd_sigma)
         gaussian_layout.addRow("Correlation Lc [µm]:", self.psd_lc)
         self.psd_param_gaussian.setLayout(gaussian_layout)
+        return self.psd_param_gaussian
 
-        # --- Elliptical Mesa
+    def _build_psd_elliptical_mesa(self):
         self.psd_param_elliptical_mesa = QWidget()
         el_layout = QFormLayout()
         self.psd_ellipticalX = QLineEdit("1.5")
@@ -180,8 +891,9 @@ class BRDFForm(QWidget):
         el_layout.addRow("Height [µm]:", self.psd_mesaHeight)
         el_layout.addRow("Density [µm⁻²]:", self.psd_mesaDensity)
         self.psd_param_elliptical_mesa.setLayout(el_layout)
+        return self.psd_param_elliptical_mesa
 
-        # --- Rectangular Mesa
+    def _build_psd_rectangular_mesa(self):
         self.psd_param_rectangular_mesa = QWidget()
         rm_layout = QFormLayout()
         self.psd_rectLenX = QLineEdit("1.5")
@@ -193,8 +905,9 @@ class BRDFForm(QWidget):
         rm_layout.addRow("Height [µm]:", self.psd_rectHeight)
         rm_layout.addRow("Density [µm⁻²]:", self.psd_rectDensity)
         self.psd_param_rectangular_mesa.setLayout(rm_layout)
+        return self.psd_param_rectangular_mesa
 
-        # --- Triangular Mesa
+    def _build_psd_triangular_mesa(self):
         self.psd_param_triangular_mesa = QWidget()
         tm_layout = QFormLayout()
         self.psd_triSide = QLineEdit("1.5")
@@ -204,8 +917,9 @@ class BRDFForm(QWidget):
         tm_layout.addRow("Height [µm]:", self.psd_triHeight)
         tm_layout.addRow("Density [µm⁻²]:", self.psd_triDensity)
         self.psd_param_triangular_mesa.setLayout(tm_layout)
+        return self.psd_param_triangular_mesa
 
-        # --- Rectangular Pyramid
+    def _build_psd_rectangular_pyramid(self):
         self.psd_param_rectangular_pyramid = QWidget()
         rp_layout = QFormLayout()
         self.psd_pyrLenX = QLineEdit("1.5")
@@ -217,8 +931,9 @@ class BRDFForm(QWidget):
         rp_layout.addRow("Height [µm]:", self.psd_pyrHeight)
         rp_layout.addRow("Density [µm⁻²]:", self.psd_pyrDensity)
         self.psd_param_rectangular_pyramid.setLayout(rp_layout)
+        return self.psd_param_rectangular_pyramid
 
-        # --- Triangular Pyramid
+    def _build_psd_triangular_pyramid(self):
         self.psd_param_triangular_pyramid = QWidget()
         tp_layout = QFormLayout()
         self.psd_tpSide = QLineEdit("1.5")
@@ -228,8 +943,9 @@ class BRDFForm(QWidget):
         tp_layout.addRow("Height [µm]:", self.psd_tpHeight)
         tp_layout.addRow("Density [µm⁻²]:", self.psd_tpDensity)
         self.psd_param_triangular_pyramid.setLayout(tp_layout)
+        return self.psd_param_triangular_pyramid
 
-        # --- Parabolic Dimple
+    def _build_psd_parabolic_dimple(self):
         self.psd_param_parabolic_dimple = QWidget()
         pd_layout = QFormLayout()
         self.psd_pdAxisX = QLineEdit("1.5")
@@ -241,68 +957,47 @@ class BRDFForm(QWidget):
         pd_layout.addRow("Height [µm]:", self.psd_pdHeight)
         pd_layout.addRow("Density [µm⁻²]:", self.psd_pdDensity)
         self.psd_param_parabolic_dimple.setLayout(pd_layout)
-
-        # Add all PSD parameter widgets, hidden by default
-        for w in [
-            self.psd_param_unit, self.psd_param_abc, self.psd_param_fractal,
-            self.psd_param_gaussian, self.psd_param_elliptical_mesa,
-            self.psd_param_rectangular_mesa, self.psd_param_triangular_mesa,
-            self.psd_param_rectangular_pyramid, self.psd_param_triangular_pyramid,
-            self.psd_param_parabolic_dimple,
-        ]:
-            w.hide()
-            psd_layout.addWidget(w)
-
-        self.psd_group.setLayout(psd_layout)
-        self.form_layout.addWidget(self.psd_group)
-
-        # ===== Controls =====
-        ctrl_row = QHBoxLayout()
-        self.run_btn = QPushButton("Run BRDFProg")
-        self.clear_btn = QPushButton("Clear Plot")
-        ctrl_row.addWidget(self.run_btn)
-        ctrl_row.addWidget(self.clear_btn)
-        self.open_output_btn = QPushButton("Open Last Output")
-        self.open_input_btn = QPushButton("Open Last Input")
-        ctrl_row.addWidget(self.open_output_btn)
-        ctrl_row.addWidget(self.open_input_btn)
-        self.form_layout.addLayout(ctrl_row)
-
-        # Output log
-        self.output_box = QTextEdit()
-        self.output_box.setReadOnly(True)
-        self.form_layout.addWidget(QLabel("Log:"))
-        self.form_layout.addWidget(self.output_box)
-
-        # Wire signals
-        self.run_btn.clicked.connect(self.run_brdfprog)
-        self.clear_btn.clicked.connect(self.clear_plot)
-        self.open_output_btn.clicked.connect(self.open_last_output)
-        self.open_input_btn.clicked.connect(self.open_last_input)
-        
-        # Keep shared parameter fields 
-        self.wavelength.textChanged.connect(
-            lambda txt: self._sync_general_to_model("lambda", txt)
-        )
-        self.substrate.textChanged.connect(
-            lambda txt: self._sync_general_to_model("substrate", txt)
-        )
-
-        # Initialize selectors
-        self.update_subclasses()
-        self.update_psd_parameters(self.psd_function.currentText())
-
-        # State for last I/O paths
-        self.last_stdout_path = None
-        self.last_input_path = None
-        self.last_csv_path = None
-        self.last_output_meta = None
+        return self.psd_param_parabolic_dimple
 
     # ===== Helpers =====
     def clear_plot(self):
         self.figure.clear()
+        self._blit_artists = []
+        self._bg_signature = None
         self.canvas.draw()
 
+    def _axes_signature(self, ax):
+        legend = ax.get_legend()
+        return (
+            tuple(self.figure.bbox.bounds),
+            tuple(ax.get_position().bounds),
+            ax.get_xlim(), ax.get_ylim(),
+            ax.get_xscale(), ax.get_yscale(),
+            ax.get_xlabel(), ax.get_ylabel(), ax.get_title(),
+            tuple(t.get_text() for t in legend.get_texts()) if legend else (),
+        )
+
+    def _blit_or_draw(self, ax):
+        """Blit only the data lines when the axes decorations are unchanged."""
+        # Multi-curve plots arrive as one LineCollection rather than Line2Ds
+        self._blit_artists = list(ax.get_lines()) + list(ax.collections)
+        for artist in self._blit_artists:
+            artist.set_animated(True)
+        if self._bg is not None and self._axes_signature(ax) == self._bg_signature:
+            self.canvas.restore_region(self._bg)
+            for artist in self._blit_artists:
+                ax.draw_artist(artist)
+            self.canvas.blit(self.figure.bbox)
+        else:
+            self.canvas.draw()
+            self._bg_signature = self._axes_signature(ax)
+
+    def _on_canvas_draw(self, event):
+        # Every full draw (first plot, resize, clear) refreshes the cached background
+        self._bg = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self._blit_artists:
+            artist.axes.draw_artist(artist)
+
     
     def update_subclasses(self):
         """Populate the 'Model Type' combo based on the selected family,
@@ -312,441 +1007,146 @@ class BRDFForm(QWidget):
         from subclass_selector or family_selector consistently.
         All names use underscores instead of spaces.
         """
-        subclasses = {
-            # --- Roughness models
-            "Roughness_BRDF_Model": [
-                "Microroughness_BRDF_Model",
-                "Correlated_Roughness_BRDF_Model",
-                "Two_Face_BRDF_Model",
-                "Roughness_Stack_BRDF_Model",
-                "Correlated_Roughness_Stack_BRDF_Model",
-                "Uncorrelated_Roughness_Stack_BRDF_Model",
-                "Growth_Roughness_Stack_BRDF_Model",
-            ],
-            # --- Facet models
-            "Facet_BRDF_Model": [
-                "Shadowed_Facet_BRDF_Model",
-                "Subsurface_Facet_BRDF_Model",
-            ],
-            # --- Lambertian
-            "Lambertian_BRDF_Model": [
-                "Diffuse_Subsurface_BRDF_Model",
-            ],
-            # --- Local particle / defect models
-            "Local_BRDF_Model": [
-                "Rayleigh_Defect_BRDF_Model",
-                "OneLayer_BRDF_Model",
-                "Rayleigh_Stack_BRDF_Model",
-                "Double_Interaction_BRDF_Model",
-                "Subsurface_Particle_BRDF_Model",
-                "Bobbert_Vlieger_BRDF_Model",
-                "Axisymmetric_Particle_BRDF_Model",
-                "Subsurface_Bobbert_Vlieger_BRDF_Model",
-                "Subsurface_Axisymmetric_Particle_BRDF_Model",
-            ],
-            # --- Instrument / measurement models
-            "Instrument_BRDF_Model": [
-                "Rayleigh_Instrument_BRDF_Model",
-                "Finite_Aperture_Instrument_BRDF_Model",
-                "Focussed_Beam_Instrument_BRDF_Model",
-            ],
-        }
-        current_family = self.family_selector.currentText()
-        items = subclasses.get(current_family, [])
-        self.subclass_selector.clear()
-        if items:
-            self.subclass_selector.addItems(items)
-        else:
-            # Concrete/standalone model families: set to the family itself
-            self.subclass_selector.addItems([current_family])
+        self._fill_subclass_items()
 
-        # Update parameter form for current selection
+        # Update parameter form for current selection, once
         self.populate_model_params()
 
-    # ---- Parameter specifications scraped from NIST docs
-    MODEL_PARAM_SPECS = {
-        # Roughness family
-        "Microroughness_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
-        ],
-        "Correlated_Roughness_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
-            ("film","dielectric_function","(1.46,0.05)"),
-            ("thickness","double","0.05"),
-        ],
-        "Two_Face_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
-            ("film","dielectric_function","(1.46,0)"),
-            ("thickness","double","0.05"),
-            ("face","int","1"),
-        ],
-        "Roughness_Stack_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("this_layer","int","0"),
-        ],
-        "Correlated_Roughness_Stack_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-        ],
-        "Uncorrelated_Roughness_Stack_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-        ],
-        "Growth_Roughness_Stack_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("psd","PSD_Function_Ptr","ABC_PSD_Function"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("intrinsic","PSD_Function_Ptr","ABC_PSD_Function"),
-            ("relaxation","double","0.05"),
-            ("exponent","double","2"),
-        ],
-        # Facet family
-        "Shadowed_Facet_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("sdf","Slope_Distribution_Function","Exponential_Slope_Distribution_Function"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("shadow","Shadow_Function","Torrance_Sparrow_Shadow_Function"),
-        ],
-        "Subsurface_Facet_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("sdf","Slope_Distribution_Function","Exponential_Slope_Distribution_Function"),
-        ],
-        # Lambertian
-        "Lambertian_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("reflectance","Reflectance","Table_Reflectance"),
-        ],
-        "Diffuse_Subsurface_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("reflectance","Reflectance","Table_Reflectance"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-        ],
-        # Local / defect
-        "Rayleigh_Defect_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("density","double","1"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("radius","double","0.001"),
-            ("distance","double","0"),
-            ("defect","dielectric_function","(1.0,0.0)"),
-        ],
-        "OneLayer_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("density","double","1"),
-            ("radius","double","0.01"),
-            ("defect","dielectric_function","(1.0,0.0)"),
-            ("film","dielectric_function","(1.59,0.0)"),
-            ("tau","double","0.05"),
-            ("depth","double","0.00"),
-        ],
-        "Rayleigh_Stack_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("density","double","1"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("radius","double","0.01"),
-            ("sphere","dielectric_function","(1,0)"),
-            ("depth","double","0"),
-        ],
-        "Double_Interaction_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("density","double","1"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("distance","double","0.05"),
-            ("scatterer","Free_Space_Scatterer_Ptr","MieScatterer"),
-            ("alpha","double","0"),
-            ("beta","double","0"),
-        ],
-        "Subsurface_Particle_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("density","double","1"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("depth","double","0"),
-            ("scatterer","Free_Space_Scatterer_Ptr","MieScatterer"),
-            ("alpha","double","0"),
-            ("beta","double","0"),
-        ],
-        "Bobbert_Vlieger_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("density","double","1"),
-            ("sphere","dielectric_function","(1.59,0)"),
-            ("radius","double","0.05"),
-            ("spherecoat","StackModel_Ptr","No_StackModel"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("delta","double","0"),
-            ("lmax","int","0"),
-            ("order","int","-1"),
-            ("Norm_Inc_Approx","int","0"),
-        ],
-        "Axisymmetric_Particle_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("density","double","1"),
-            ("Shape","Axisymmetric_Shape","Ellipsoid_Axisymmetric_Shape"),
-            ("particle","dielectric_function","(1.59,0)"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("delta","double","0"),
-            ("lmax","int","0"),
-            ("nmax","int","0"),
-            ("order","int","-1"),
-            ("Norm_Inc_Approx","int","0"),
-            ("improve","int","3"),
-        ],
-        "Subsurface_Bobbert_Vlieger_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("density","double","1"),
-            ("sphere","dielectric_function","(1.59,0)"),
-            ("radius","double","0.05"),
-            ("spherecoat","StackModel_Ptr","No_StackModel"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("delta","double","0"),
-            ("lmax","int","0"),
-            ("order","int","-1"),
-            ("Norm_Inc_Approx","int","0"),
-            ("improve","int","3"),
-        ],
-        "Subsurface_Axisymmetric_Particle_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("density","double","1"),
-            ("Shape","Axisymmetric_Shape","Ellipsoid_Axisymmetric_Shape"),
-            ("particle","dielectric_function","(1.59,0)"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("delta","double","0"),
-            ("lmax","int","0"),
-            ("nmax","int","0"),
-            ("order","int","-1"),
-            ("Norm_Inc_Approx","int","0"),
-            ("improve","int","3"),
-        ],
-        # Instrument
-        "Rayleigh_Instrument_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("field_of_view","double","1000"),
-            ("air","dielectric_function","(1+2784E-7,0)"),
-            ("number_density","double","2.51E-7"),
-        ],
-        "Finite_Aperture_Instrument_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("alpha","double","0"),
-            ("integralmode","int","3"),
-            ("model","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-        ],
-        "Focussed_Beam_Instrument_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("model","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-            ("alpha","double","0"),
-            ("integralmode","int","3"),
-            ("focal_point","double","1"),
-        ],
-        # Utilities
-        "First_Diffuse_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("depoll","double","0"),
-            ("depolc","double","0"),
-            ("phase_function","Polarized_Phase_Function_Ptr","Unpolarized_Phase_Function"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-        ],
-        "Two_Source_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("factor1","double","1"),
-            ("source1","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-            ("factor2","double","1"),
-            ("source2","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-            ("correlation","double","0"),
-        ],
-        "Three_Source_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("factor1","double","1"),
-            ("source1","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-            ("factor2","double","1"),
-            ("source2","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-            ("factor3","double","1"),
-            ("source3","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-        ],
-        "Four_Source_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("factor1","double","1"),
-            ("source1","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-            ("factor2","double","1"),
-            ("source2","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-            ("factor3","double","1"),
-            ("source3","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-            ("factor4","double","1"),
-            ("source4","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-        ],
-        "Transmit_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("model","BRDF_Model_Ptr","Microroughness_BRDF_Model"),
-            ("films","StackModel_Ptr","No_StackModel"),
-        ],
-        "RCW_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("alpha","double","0.0175"),
-            ("order","int","25"),
-            ("grating","Grating_Ptr","Single_Line_Grating"),
-        ],
-        "CrossRCW_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("alpha","double","0.0175"),
-            ("RCW","CrossRCW_Model_Ptr","CrossRCW_Model"),
-        ],
-        "ZernikeExpansion_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("coefficientfile","string",""),
-            ("scale","Table","1"),
-        ],
-        "Polydisperse_Sphere_BRDF_Model": [
-            ("lambda","double","0.532"),
-            ("type","int","0"),
-            ("substrate","dielectric_function","(4.05,0.05)"),
-            ("distribution","SurfaceParticleSizeDistribution","SurfaceParticleSizeDistribution"),
-            ("stack","StackModel_Ptr","No_StackModel"),
-            ("particle","dielectric_function","(1.5,0.0)"),
-            ("Dstart","double","0.1"),
-            ("Dend","double","100"),
-            ("Dstep","double","0.01"),
-            ("fractional_coverage","double","0"),
-            ("antirainbow","double","0"),
-        ],
-    }
+    def _fill_subclass_items(self):
+        current_family = self.family_selector.currentText()
+        items = _SUBCLASSES.get(current_family, ())
+        # Concrete/standalone model families: set to the family itself
+        self.subclass_selector.setUpdatesEnabled(False)
+        was_blocked = self.subclass_selector.blockSignals(True)
+        try:
+            self.subclass_selector.clear()
+            self.subclass_selector.addItems(items or [current_family])
+        finally:
+            self.subclass_selector.blockSignals(was_blocked)
+            self.subclass_selector.setUpdatesEnabled(True)
 
     def populate_model_params(self):
-        """Rebuild parameter widgets when model selection changes."""
-        # Clear existing rows
-        while self.model_params_layout.count():
-            item = self.model_params_layout.takeAt(0)
-            w = item.widget()
-            if w is not None:
-                w.deleteLater()
-
+        """Show the parameter widgets for the selected model, building them on first use."""
         model = self.subclass_selector.currentText() or self.family_selector.currentText()
-        specs = self.MODEL_PARAM_SPECS.get(model, [])
-        self.param_widgets = {}
-        for name, dtype, default in specs:
-            # Skip PSD pointer here; PSD is configured in the dedicated PSD section
-            if name.lower() == "psd" or dtype == "PSD_Function_Ptr":
-                continue
-            le = QLineEdit(str(default))
-            self.param_widgets[name] = le
-            label = f"{name} ({dtype}):"
-            self.model_params_layout.addRow(label, le)
-
-            lowered = name.lower()
-            if lowered == "lambda":
-                le.setText(self.wavelength.text())
-            elif lowered == "substrate":
-                le.setText(self.substrate.text())
-            elif lowered == "type":
-                le.setText(self.DIRECTION_CODES.get(self.direction.currentText(), str(default)))
+        if model == self._current_model:
+            return
+        self._current_model = model
+        self.model_params_group.setUpdatesEnabled(False)
+        try:
+            page = self._params_pages.get(model)
+            if page is None:
+                page = self._build_params_page(model)
+                self._params_pages[model] = page
+            widget, self.param_widgets = page
+
+            # Shared fields follow the general section
+            for name, le in self.param_widgets.items():
+                lowered = name.lower()
+                if lowered == "lambda":
+                    le.setText(self.wavelength.text())
+                elif lowered == "substrate":
+                    le.setText(self.substrate.text())
+                elif lowered == "type":
+                    le.setText(self.direction.currentData() or le.text())
+            self._set_stack_page(self._params_stack, widget)
+        finally:
+            self.model_params_group.setUpdatesEnabled(True)
+            self.model_params_group.update()
+
+    def _build_params_page(self, model: str):
+        page = QWidget()
+        layout = QFormLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        edits = {}
+        for name, dtype, default, label in _MODEL_SPECS_UI.get(model, ()):
+            le = QLineEdit(default)
+            if dtype == "double":
+                le.setValidator(self._dval)
+            elif dtype == "int":
+                le.setValidator(self._ival)
+            edits[name] = le
+            layout.addRow(label, le)
+        page.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        self._params_stack.addWidget(page)
+        return page, edits
+
+    def _set_stack_page(self, stack: QStackedWidget, widget: QWidget):
+        # Hidden pages are ignored so the stack sizes to the visible one
+        current = stack.currentWidget()
+        if current is not None and current is not widget:
+            current.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        widget.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        stack.setCurrentWidget(widget)
 
     def update_psd_parameters(self, current: str):
-        mapping = {
-            "Unit_PSD_Function": self.psd_param_unit,
-            "ABC_PSD_Function": self.psd_param_abc,
-            "Fractal_PSD_Function": self.psd_param_fractal,
-            "Gaussian_PSD_Function": self.psd_param_gaussian,
-            "Elliptical_Mesa_PSD_Function": self.psd_param_elliptical_mesa,
-            "Rectangular_Mesa_PSD_Function": self.psd_param_rectangular_mesa,
-            "Triangular_Mesa_PSD_Function": self.psd_param_triangular_mesa,
-            "Rectangular_Pyramid_PSD_Function": self.psd_param_rectangular_pyramid,
-            "Triangular_Pyramid_PSD_Function": self.psd_param_triangular_pyramid,
-            "Parabolic_Dimple_PSD_Function": self.psd_param_parabolic_dimple,
-        }
-        for w in mapping.values():
-            w.hide()
-        widget = mapping.get(current)
-        if widget is not None:
-            widget.show()
-            
+        if current not in self._psd_index:
+            if current not in self._PSD_BUILDERS:
+                return
+            self._build_psd_panel(current)
+        self._set_stack_page(self.psd_stack, self.psd_stack.widget(self._psd_index[current]))
+
+    def _build_psd_panel(self, name: str):
+        w = getattr(self, self._PSD_BUILDERS[name])()
+        w.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        self._psd_index[name] = self.psd_stack.addWidget(w)
+
+    def _ensure_psd_panels(self):
+        for name in self._PSD_BUILDERS:
+            if name not in self._psd_index:
+                self._build_psd_panel(name)
+
+    def _sync_lambda(self, text: str):
+        self._queue_sync("lambda", text)
+
+    def _sync_substrate(self, text: str):
+        self._queue_sync("substrate", text)
+
+    def _queue_sync(self, name: str, text: str):
+        self._pending_sync[name] = text
+        self._sync_timer.start()
+
+    def _flush_sync(self):
+        pending, self._pending_sync = self._pending_sync, {}
+        for name, text in pending.items():
+            self._sync_general_to_model(name, text)
+
     def _sync_general_to_model(self, name: str, text: str):
-        widget = getattr(self, "param_widgets", {}).get(name)
+        widget = self.param_widgets.get(name)
         if widget is not None and widget.text() != text:
+            widget.blockSignals(True)
             widget.setText(text)
+            widget.blockSignals(False)
 
     def _on_direction_changed(self, selection: str):
-        value = self.DIRECTION_CODES.get(selection)
+        codes, widgets = self.DIRECTION_CODES, self.param_widgets
+        value = codes.get(selection)
         if value is None:
             return
-        widget = getattr(self, "param_widgets", {}).get("type")
+        widget = widgets.get("type")
         if widget is not None and widget.text() != value:
-            widget.setText(value)  
+            widget.setText(value)
             
+    def _log(self, message: str):
+        if self._log_buffer is not None:
+            self._log_buffer.append(message)
+        else:
+            self.output_box.append(message)
+
+    def _plot_axes(self):
+        """Return the plot axes, cleared; recreated only after clear_plot."""
+        ax = self._ax
+        if ax is None or ax not in self.figure.axes:
+            self.figure.clear()
+            ax = self._ax = self.figure.add_subplot(111)
+        else:
+            ax.cla()
+        return ax
+
     # ===== External plot helper =====
     def render_with_external(self, csv_path: str, *, x_col: int = None, y_col: int = None, semilogy: bool = True):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-
-        here = Path(__file__).resolve().parent
-        cwd = Path(os.getcwd())
-        csv_dir = Path(csv_path).resolve().parent if csv_path else None
+        self._ensure_built()
+        self._blit_artists = []
+        ax = self._plot_axes()
 
         meta = getattr(self, "last_output_meta", None)
         if not meta or meta.get("csv_path") != csv_path:
@@ -754,50 +1154,57 @@ class BRDFForm(QWidget):
         if meta:
             self.last_output_meta = meta
 
+        # brdfplot is resolved once per process and reused by later renders
         tried = []
-        mod = None
-        how = None
+        cached = type(self)._brdfplot_cache
+        if cached is not None:
+            mod, how = cached
+        else:
+            mod = None
+            how = None
 
-        def _try_import(name):
-            nonlocal mod, how
-            try:
-                mod = importlib.import_module(name)
-                how = f"import {name}"
-                return True
-            except Exception as e:
-                tried.append(f"import {name}: {e}")
+            def _try_import(name):
+                nonlocal mod, how
+                try:
+                    mod = importlib.import_module(name)
+                    how = f"import {name}"
+                    return True
+                except Exception as e:
+                    tried.append(f"import {name}: {e}")
+                    return False
+
+            def _try_path(path):
+                nonlocal mod, how
+                try:
+                    if path and path.exists():
+                        spec = importlib.util.spec_from_file_location("brdfplot", str(path))
+                        if spec and spec.loader:
+                            mod = importlib.util.module_from_spec(spec)
+                            sys.modules["brdfplot"] = mod
+                            spec.loader.exec_module(mod)
+                            how = f"spec_from_file_location({path})"
+                            return True
+                except Exception as e:
+                    tried.append(f"load {path}: {e}")
                 return False
 
-        def _try_path(path):
-            nonlocal mod, how
-            try:
-                if path and path.exists():
-                    spec = importlib.util.spec_from_file_location("brdfplot", str(path))
-                    if spec and spec.loader:
-                        mod = importlib.util.module_from_spec(spec)
-                        sys.modules["brdfplot"] = mod
-                        spec.loader.exec_module(mod)
-                        how = f"spec_from_file_location({path})"
-                        return True
-            except Exception as e:
-                tried.append(f"load {path}: {e}")
-            return False
-
-        if not _try_import("brdfplot"):
-            if not _try_path(here / "brdfplot.py"):
-                if not _try_path(cwd / "brdfplot.py") and csv_dir:
-                    _try_path(csv_dir / "brdfplot.py")
+            if not _try_import("brdfplot"):
+                if not _try_path(_HERE / "brdfplot.py"):
+                    if not _try_path(Path(os.getcwd()) / "brdfplot.py") and csv_path:
+                        _try_path(Path(csv_path).resolve().parent / "brdfplot.py")
+            if mod is not None:
+                type(self)._brdfplot_cache = (mod, how)
 
         if mod is None:
-            self.output_box.append("Could not import brdfplot.py: " + " | ".join(tried))
+            self._log("Could not import brdfplot.py: " + " | ".join(tried))
             self.canvas.draw()
             return
         else:
-            self.output_box.append(f"brdfplot resolved via: {how}")
+            self._log(f"brdfplot resolved via: {how}")
 
         fn = getattr(mod, "plot_csv", None)
         if not callable(fn):
-            self.output_box.append("brdfplot.py found, but it must define plot_csv(ax, csv_path, ...).")
+            self._log("brdfplot.py found, but it must define plot_csv(ax, csv_path, ...).")
             self.canvas.draw()
             return
 
@@ -806,14 +1213,25 @@ class BRDFForm(QWidget):
                 fn(ax, csv_path, x_col=x_col, y_col=y_col, semilogy=semilogy, meta=meta)
             except TypeError:
                 fn(ax, csv_path, x_col=x_col, y_col=y_col, semilogy=semilogy)
-            self.canvas.draw()
-            self.output_box.append("Plot updated via brdfplot.plot_csv")
+            self._blit_or_draw(ax)
+            self._log("Plot updated via brdfplot.plot_csv")
         except Exception as e:
-            self.output_box.append(f"brdfplot render error: {e}")
+            self._log(f"brdfplot render error: {e}")
             self.canvas.draw()
 
     # ===== Run BRDFProg =====
     def run_brdfprog(self):
+        self._ensure_built()
+        # Progress lines are collected and appended to output_box in one update
+        self._log_buffer = []
+        try:
+            self._run_brdfprog()
+        finally:
+            messages, self._log_buffer = self._log_buffer, None
+            if messages:
+                self.output_box.append("\n".join(messages))
+
+    def _run_brdfprog(self):
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         data_dir = os.path.join("..", "DATA")
         os.makedirs(data_dir, exist_ok=True)
@@ -821,46 +1239,6 @@ class BRDFForm(QWidget):
         output_filename = os.path.join(data_dir, f"brdf_output_{timestamp}.txt")
         csv_filename = os.path.join(data_dir, f"brdf_output_{timestamp}.csv")
 
-        model_family_map = {
-            "Roughness_BRDF_Model": "A",
-            "Facet_BRDF_Model": "B",
-            "Lambertian_BRDF_Model": "C",
-            "Local_BRDF_Model": "D",
-            "Instrument_BRDF_Model": "E",
-            "First_Diffuse_BRDF_Model": "F",
-            "Two_Source_BRDF_Model": "G",
-            "Three_Source_BRDF_Model": "H",
-            "Four_Source_BRDF_Model": "I",
-            "Transmit_BRDF_Model": "J",
-            "RCW_BRDF_Model": "K",
-            "CrossRCW_BRDF_Model": "L",
-            "ZernikeExpansion_BRDF_Model": "M",
-            "Polydisperse_Sphere_BRDF_Model": "N",
-        }
-        subclass_map = {
-            "Microroughness_BRDF_Model": "A",
-            "Correlated_Roughness_BRDF_Model": "B",
-            "Roughness_Stack_BRDF_Model": "C",
-            "Correlated_Roughness_Stack_BRDF_Model": "D",
-            "Uncorrelated_Roughness_Stack_BRDF_Model": "E",
-            "Growth_Roughness_Stack_BRDF_Model": "F",
-            "Two_Face_BRDF_Model": "G",
-        }
-        psd_map = {
-            "Unit_PSD_Function": "A",
-            "ABC_PSD_Function": "B",
-            "Table_PSD_Function": "C",
-            "Fractal_PSD_Function": "D",
-            "Gaussian_PSD_Function": "E",
-            "Elliptical_Mesa_PSD_Function": "F",
-            "Rectangular_Mesa_PSD_Function": "G",
-            "Triangular_Mesa_PSD_Function": "H",
-            "Rectangular_Pyramid_PSD_Function": "I",
-            "Triangular_Pyramid_PSD_Function": "J",
-            "Parabolic_Dimple_PSD_Function": "K",
-            "Double_PSD_Function": "L",
-        }
-
         # Gather inputs in the order expected by brdfprog
         input_lines = [
             self.incident_angle.text(), self.scatter_start.text(), self.scatter_end.text(),
@@ -868,49 +1246,29 @@ class BRDFForm(QWidget):
             self.azimuth_step.text(),
         ]
 
+        direction_code = self.DIRECTION_CODES.get(self.direction.currentText())
         fam = self.family_selector.currentText()
-        input_lines.append(model_family_map.get(fam, "A"))
+        input_lines.append(self.MODEL_FAMILY_MAP.get(fam, "A"))
         if fam == "Roughness_BRDF_Model" and self.subclass_selector.currentText():
-            input_lines.append(subclass_map.get(self.subclass_selector.currentText(), "A"))
+            input_lines.append(self.SUBCLASS_MAP.get(self.subclass_selector.currentText(), "A"))
 
         input_lines += [
             self.wavelength.text(),
             self.substrate.text(),
-            self.DIRECTION_CODES.get(self.direction.currentText(), "0"),
-            psd_map.get(self.psd_function.currentText(), "A"),
+            direction_code or "0",
+            self.PSD_MAP.get(self.psd_function.currentText(), "A"),
         ]
 
         # PSD-specific params
         current = self.psd_function.currentText()
-        if current == "Unit_PSD_Function":
-            pass
-        elif current == "ABC_PSD_Function":
-            input_lines += [self.psd_A.text(), self.psd_B.text(), self.psd_C.text()]
-        elif current == "Fractal_PSD_Function":
-            input_lines += [self.psd_fractalAmp.text(), self.psd_fractalExp.text()]
-        elif current == "Gaussian_PSD_Function":
-            input_lines += [self.psd_sigma.text(), self.psd_lc.text()]
-        elif current == "Elliptical_Mesa_PSD_Function":
-            input_lines += [self.psd_ellipticalX.text(), self.psd_ellipticalY.text(),
-                            self.psd_mesaHeight.text(), self.psd_mesaDensity.text()]
-        elif current == "Rectangular_Mesa_PSD_Function":
-            input_lines += [self.psd_rectLenX.text(), self.psd_rectLenY.text(),
-                            self.psd_rectHeight.text(), self.psd_rectDensity.text()]
-        elif current == "Triangular_Mesa_PSD_Function":
-            input_lines += [self.psd_triSide.text(), self.psd_triHeight.text(), self.psd_triDensity.text()]
-        elif current == "Rectangular_Pyramid_PSD_Function":
-            input_lines += [self.psd_pyrLenX.text(), self.psd_pyrLenY.text(),
-                            self.psd_pyrHeight.text(), self.psd_pyrDensity.text()]
-        elif current == "Triangular_Pyramid_PSD_Function":
-            input_lines += [self.psd_tpSide.text(), self.psd_tpHeight.text(), self.psd_tpDensity.text()]
-        elif current == "Parabolic_Dimple_PSD_Function":
-            input_lines += [self.psd_pdAxisX.text(), self.psd_pdAxisY.text(),
-                            self.psd_pdHeight.text(), self.psd_pdDensity.text()]
-        else:
+        try:
+            names = self.PSD_FIELDS[current]
+        except KeyError:
             raise ValueError(f"Unsupported PSD function: {current}")
+        input_lines.extend(getattr(self, n).text() for n in names)
 
         model = self.subclass_selector.currentText() or self.family_selector.currentText()
-        specs = self.MODEL_PARAM_SPECS.get(model, [])
+        specs = self.MODEL_PARAM_SPECS.get(model, ())
         for name, _dtype, default in specs:
             lowered = name.lower()
             if lowered in {"psd", "lambda", "substrate"}:
@@ -918,14 +1276,20 @@ class BRDFForm(QWidget):
             widget = self.param_widgets.get(name)
             value = widget.text().strip() if widget is not None else str(default)
             if lowered == "type":
-                value = self.DIRECTION_CODES.get(self.direction.currentText(), value)
+                value = direction_code or value
             input_lines.append(value)
 
         try:
             with open(input_filename, "w", encoding="utf-8") as f:
                 f.write("\n".join(input_lines))
 
-            exe = shutil.which("brdfprog")
+            # The PATH lookup is done once; later runs only check it still exists
+            exe = type(self)._exe_path
+            if exe and not os.path.exists(exe):
+                exe = None
+            if not exe:
+                exe = shutil.which("brdfprog")
+                type(self)._exe_path = exe
             if not exe:
                 self.output_box.setText(
                     "[Error] 'brdfprog' not found. Ensure it is on PATH or next to the app.\n"
@@ -934,74 +1298,69 @@ class BRDFForm(QWidget):
                 return
 
             self.last_input_path = input_filename
-            self.output_box.setText(
-
-                f"Saved input deck: {input_filename}\nRunning BRDFProg: {exe}"
-            )
+            self.output_box.setText(f"Running BRDFProg: {exe}")
 
-            with open(input_filename, "r", encoding="utf-8") as stdin_file:
+            # brdfprog writes straight into the output file; it is read back
+            # once for parsing instead of being held in a pipe buffer.
+            with open(input_filename, "rb") as stdin_file, open(output_filename, "wb") as out_file:
                 try:
                     result = subprocess.run(
                         [exe],
                         stdin=stdin_file,
-                        stdout=subprocess.PIPE,
+                        stdout=out_file,
                         stderr=subprocess.PIPE,
-                        text=True,
                         check=False,
                     )
                 except Exception as e:
-                    self.output_box.setText(f"[Error] Could not invoke brdfprog: {e}")
-                    return                
+                    result = None
+                    error = e
+            if result is None or result.returncode != 0:
+                try:
+                    os.remove(output_filename)
+                except OSError:
+                    pass
+                if result is None:
+                    self.output_box.setText(f"[Error] Could not invoke brdfprog: {error}")
+                else:
+                    stderr = result.stderr.decode("utf-8", errors="replace")
+                    self.output_box.setText(f"[Error] brdfprog failed:\n{stderr}")
+                return
 
-            if result.returncode != 0:
-                self.output_box.setText(f"[Error] brdfprog failed:\n{result.stderr}" )
+            with open(output_filename, "rb") as f:
+                raw_stdout = f.read()
+
+            # Re-running an identical deck gives identical output: keep the
+            # previous run's files instead of writing another copy.
+            digest = hashlib.blake2b(
+                "\n".join(input_lines).encode("utf-8") + b"\0" + raw_stdout, digest_size=16
+            ).hexdigest()
+            previous = self._last_run
+            if previous and previous[0] == digest and all(os.path.exists(path) for path in previous[1:]):
+                _digest, prev_csv, prev_stdout, prev_input = previous
+                # A re-click within the same second reuses the same file
+                # names, so the "new" files may be the previous run's own
+                for path in (output_filename, input_filename):
+                    try:
+                        if not any(os.path.samefile(path, kept) for kept in previous[1:]):
+                            os.remove(path)
+                    except OSError:
+                        pass
+                self.last_input_path = prev_input
+                self.last_stdout_path = prev_stdout
+                self.last_csv_path = prev_csv
+                self._log(f"brdfprog output unchanged; reusing {prev_csv}")
+                self.render_with_external(prev_csv)
                 return
 
-            with open(output_filename, "w", encoding="utf-8") as f:
-                f.write(result.stdout)
+            self._log(f"Saved input deck: {input_filename}")
+            stdout_text = raw_stdout.decode("utf-8", errors="replace")
             self.last_stdout_path = output_filename
-            self.output_box.append("brdfprog completed. Parsing output table…")
+            self._log("brdfprog completed. Parsing output table…")
 
-
-            numeric_rows = []
-            header_tokens = []
-            last_text_tokens = []
-            splitter = re.compile(r"[\s,]+")
-            for raw_line in result.stdout.splitlines():
-                line = raw_line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                tokens = [tok for tok in splitter.split(line) if tok]
-                if not tokens:
-                    continue
-                row = []
-                numeric = True
-                for tok in tokens:
-                    cleaned = tok.replace("D", "E").replace("d", "E")
-                    try:
-                        value = float(cleaned)
-                    except ValueError:
-                        numeric = False
-                        break
-                    row.append(value)
-                if numeric and row:
-                    numeric_rows.append(row)
-                    if not header_tokens and last_text_tokens:
-                        header_tokens = list(last_text_tokens)
-                else:
-                    last_text_tokens = list(tokens)
-
-            if not header_tokens and last_text_tokens:
-                header_tokens = list(last_text_tokens)
-                
-            if numeric_rows:
-                with open(csv_filename, "w", newline="", encoding="utf-8") as csvfile:
-                    writer = csv.writer(csvfile)
-                    for row in numeric_rows:
-                        writer.writerow(row)
-                self.output_box.append(f"Saved CSV: {csv_filename}")
+            column_count, header_tokens = _numeric_output_to_csv(stdout_text, csv_filename)
+            if column_count:
+                self._log(f"Saved CSV: {csv_filename}")
                 self.last_csv_path = csv_filename
-                column_count = max(len(r) for r in numeric_rows)
                 meta = self._build_output_meta(
                     csv_filename=csv_filename,
                     stdout_path=output_filename,
@@ -1012,23 +1371,76 @@ class BRDFForm(QWidget):
                 )
                 if meta:
                     meta_path = csv_filename + ".meta.json"
+                    self._meta_cache.pop(str(Path(meta_path)), None)
                     try:
                         Path(meta_path).write_text(json.dumps(meta, indent=2), encoding="utf-8")
-                        self.output_box.append(f"Saved metadata: {meta_path}")
+                        self._log(f"Saved metadata: {meta_path}")
                     except Exception as e:
-                        self.output_box.append(f"[Warn] Could not write metadata: {e}")
+                        self._log(f"[Warn] Could not write metadata: {e}")
                     self.last_output_meta = meta
                 if header_tokens:
                     preview = ", ".join(header_tokens[:8])
-                    self.output_box.append(f"Detected header tokens: {preview}")
+                    self._log(f"Detected header tokens: {preview}")
                 else:
-                    self.output_box.append("No textual header detected; using numeric inference.")
+                    self._log("No textual header detected; using numeric inference.")
+                self._last_run = (digest, csv_filename, output_filename, input_filename)
+                self._index_run(
+                    data_dir, timestamp, csv_filename, output_filename, input_filename,
+                    csv_filename + ".meta.json" if meta else None,
+                )
                 self.render_with_external(csv_filename)
             else:
-                self.output_box.append("No numeric data detected in BRDFProg output; graph not updated.")
-        except Exception as e:  
+                self._log("No numeric data detected in BRDFProg output; graph not updated.")
+        except Exception as e:
+            self._log_buffer.clear()
             self.output_box.setText(f"[Exception] {e}")
 
+    @classmethod
+    def _run_index(cls, data_dir):
+        """Connection to the run index in data_dir, or None if it can't be opened."""
+        path = os.path.abspath(os.path.join(data_dir, _RUN_INDEX_NAME))
+        cached = cls._run_db
+        if cached is not None and cached[0] == path:
+            return cached[1]
+        if not os.path.isdir(data_dir):
+            return None
+        try:
+            conn = sqlite3.connect(path, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "ts TEXT PRIMARY KEY, csv TEXT, txt TEXT, input TEXT, meta TEXT)"
+            )
+        except sqlite3.Error:
+            return None
+        cls._run_db = (path, conn)
+        return conn
+
+    def _index_run(self, data_dir, timestamp, csv_path, txt_path, input_path, meta_path):
+        conn = self._run_index(data_dir)
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs (ts, csv, txt, input, meta) VALUES (?, ?, ?, ?, ?)",
+                (timestamp, csv_path, txt_path, input_path, meta_path),
+            )
+        except sqlite3.Error as e:
+            self._log(f"[Warn] Could not update run index: {e}")
+
+    def _latest_indexed_run(self, data_dir):
+        """Newest indexed run whose CSV still exists, or None."""
+        conn = self._run_index(data_dir)
+        if conn is None:
+            return None
+        try:
+            run = conn.execute("SELECT * FROM runs ORDER BY ts DESC LIMIT 1").fetchone()
+        except sqlite3.Error:
+            return None
+        if run is None or not run["csv"] or not os.path.exists(run["csv"]):
+            return None
+        return run
+
     def _safe_float(self, text):
         if text is None:
             return None
@@ -1083,13 +1495,21 @@ class BRDFForm(QWidget):
     def _load_output_meta(self, csv_path: str):
         if not csv_path:
             return None
+        meta_path = Path(str(csv_path) + ".meta.json")
+        try:
+            mtime = meta_path.stat().st_mtime_ns
+        except OSError:
+            return None
+        # Parsed sidecars are reused until the file changes on disk
+        cached = self._meta_cache.get(str(meta_path))
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
         try:
-            meta_path = Path(str(csv_path) + ".meta.json")
-            if not meta_path.exists():
-                return None
-            return json.loads(meta_path.read_text(encoding="utf-8"))
+            meta = json.loads(meta_path.read_bytes())
         except Exception:
             return None
+        self._meta_cache[str(meta_path)] = (mtime, meta)
+        return meta
 
     # ======= Data API: save/load params =======
     def _get_text(self, name: str, default: str = "") -> str:
@@ -1103,95 +1523,66 @@ class BRDFForm(QWidget):
 
     def to_params(self) -> dict:
         """Collect current settings to a dict."""
+        self._ensure_built()
+        self._ensure_psd_panels()
+        get_text = self._get_text
         data = {
             "program": "BRDFProg",
-            "angles": {
-                "incident_deg": self._get_text("incident_angle"),
-                "scatter_start_deg": self._get_text("scatter_start"),
-                "scatter_end_deg": self._get_text("scatter_end"),
-                "scatter_step_deg": self._get_text("scatter_step"),
-                "azimuth_start_deg": self._get_text("azimuth_start"),
-                "azimuth_end_deg": self._get_text("azimuth_end"),
-                "azimuth_step_deg": self._get_text("azimuth_step"),
-            },
+            "angles": {key: get_text(name) for key, name in self.ANGLE_FIELDS.items()},
             "general": {
-                "wavelength_um": self._get_text("wavelength"),
-                "substrate": self._get_text("substrate"),
-                "direction": self.direction.currentText() if hasattr(self, "direction") else "",
+                **{key: get_text(name) for key, name in self.GENERAL_FIELDS.items()},
+                "direction": self.direction.currentText(),
             },
-            "family": self.family_selector.currentText() if hasattr(self, "family_selector") else "",
-            "model": self.subclass_selector.currentText() if hasattr(self, "subclass_selector") else "",
-            "psd_active": self.psd_function.currentText() if hasattr(self, "psd_function") else "",
+            "family": self.family_selector.currentText(),
+            "model": self.subclass_selector.currentText(),
+            "psd_active": self.psd_function.currentText(),
             "psd_all": {},
         }
 
         # also serialize all PSD panes irrespective of visibility
-        data["psd_all"]["ABC_PSD_Function"] = {
-            "A_um4": self._get_text("psd_A"),
-            "B_um": self._get_text("psd_B"),
-            "C": self._get_text("psd_C"),
-        }
-        data["psd_all"]["Fractal_PSD_Function"] = {
-            "A_um4": self._get_text("psd_fractalAmp"),
-            "gamma": self._get_text("psd_fractalExp"),
-        }
-        data["psd_all"]["Gaussian_PSD_Function"] = {
-            "sigma_um": self._get_text("psd_sigma"),
-            "Lc_um": self._get_text("psd_lc"),
-        }
-        data["psd_all"]["Elliptical_Mesa_PSD_Function"] = {
-            "axisx_um": self._get_text("psd_ellipticalX"),
-            "axisy_um": self._get_text("psd_ellipticalY"),
-            "height_um": self._get_text("psd_mesaHeight"),
-            "density_um^-2": self._get_text("psd_mesaDensity"),
-        }
-        data["psd_all"]["Rectangular_Mesa_PSD_Function"] = {
-            "lengthx_um": self._get_text("psd_rectLenX"),
-            "lengthy_um": self._get_text("psd_rectLenY"),
-            "height_um": self._get_text("psd_rectHeight"),
-            "density_um^-2": self._get_text("psd_rectDensity"),
-        }
-        data["psd_all"]["Triangular_Mesa_PSD_Function"] = {
-            "side_um": self._get_text("psd_triSide"),
-            "height_um": self._get_text("psd_triHeight"),
-            "density_um^-2": self._get_text("psd_triDensity"),
-        }
-        data["psd_all"]["Rectangular_Pyramid_PSD_Function"] = {
-            "lengthx_um": self._get_text("psd_pyrLenX"),
-            "lengthy_um": self._get_text("psd_pyrLenY"),
-            "height_um": self._get_text("psd_pyrHeight"),
-            "density_um^-2": self._get_text("psd_pyrDensity"),
-        }
-        data["psd_all"]["Triangular_Pyramid_PSD_Function"] = {
-            "side_um": self._get_text("psd_tpSide"),
-            "height_um": self._get_text("psd_tpHeight"),
-            "density_um^-2": self._get_text("psd_tpDensity"),
-        }
-        data["psd_all"]["Parabolic_Dimple_PSD_Function"] = {
-            "axisx_um": self._get_text("psd_pdAxisX"),
-            "axisy_um": self._get_text("psd_pdAxisY"),
-            "height_um": self._get_text("psd_pdHeight"),
-            "density_um^-2": self._get_text("psd_pdDensity"),
-        }
+        for psd, fields in self.PSD_FIELD_MAP.items():
+            if fields:
+                data["psd_all"][psd] = {key: get_text(name) for key, name in fields.items()}
         return data
 
     def from_params(self, p: dict):
+        self._ensure_built()
+        self._ensure_psd_panels()
+        # Hold off the selector/shared-field slots while loading and refresh
+        # the dependent panels once at the end
+        blockers = [
+            QSignalBlocker(w) for w in (
+                self.family_selector, self.subclass_selector, self.direction,
+                self.psd_function, self.wavelength, self.substrate,
+            )
+        ]
+        try:
+            self._apply_params(p)
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
+
+        self.populate_model_params()
+        self.update_psd_parameters(self.psd_function.currentText())
+        self._sync_timer.stop()
+        self._pending_sync.clear()
+        self._sync_general_to_model("lambda", self.wavelength.text())
+        self._sync_general_to_model("substrate", self.substrate.text())
+        self._on_direction_changed(self.direction.currentText())
+        return True
+
+    def _apply_params(self, p: dict):
         try:
             angles = p.get("angles", {})
-            self._set_text("incident_angle", angles.get("incident_deg"))
-            self._set_text("scatter_start", angles.get("scatter_start_deg"))
-            self._set_text("scatter_end", angles.get("scatter_end_deg"))
-            self._set_text("scatter_step", angles.get("scatter_step_deg"))
-            self._set_text("azimuth_start", angles.get("azimuth_start_deg"))
-            self._set_text("azimuth_end", angles.get("azimuth_end_deg"))
-            self._set_text("azimuth_step", angles.get("azimuth_step_deg"))
+            for key, name in self.ANGLE_FIELDS.items():
+                self._set_text(name, angles.get(key))
         except Exception:
             pass
 
         try:
             gen = p.get("general", {})
-            self._set_text("wavelength", gen.get("wavelength_um"))
-            self._set_text("substrate", gen.get("substrate"))
+            for key, name in self.GENERAL_FIELDS.items():
+                self._set_text(name, gen.get(key))
             if "direction" in gen:
                 txt = gen.get("direction") or ""
                 idx = self.direction.findText(txt)
@@ -1206,6 +1597,7 @@ class BRDFForm(QWidget):
                 i = self.family_selector.findText(fam)
                 if i >= 0:
                     self.family_selector.setCurrentIndex(i)
+                    self._fill_subclass_items()
         except Exception:
             pass
 
@@ -1224,7 +1616,6 @@ class BRDFForm(QWidget):
             i = self.psd_function.findText(psd_func)
             if i >= 0:
                 self.psd_function.setCurrentIndex(i)
-                self.update_psd_parameters(psd_func)
         except Exception:
             pass
 
@@ -1235,68 +1626,23 @@ class BRDFForm(QWidget):
                 if name in self.__dict__ and key in dct and dct[key] is not None:
                     getattr(self, name).setText(str(dct[key]))
 
-            if "ABC_PSD_Function" in psd_all:
-                d = psd_all["ABC_PSD_Function"]
-                set_text("psd_A", "A_um4", d)
-                set_text("psd_B", "B_um", d)
-                set_text("psd_C", "C", d)
-            if "Fractal_PSD_Function" in psd_all:
-                d = psd_all["Fractal_PSD_Function"]
-                set_text("psd_fractalAmp", "A_um4", d)
-                set_text("psd_fractalExp", "gamma", d)
-            if "Gaussian_PSD_Function" in psd_all:
-                d = psd_all["Gaussian_PSD_Function"]
-                set_text("psd_sigma", "sigma_um", d)
-                set_text("psd_lc", "Lc_um", d)
-            if "Elliptical_Mesa_PSD_Function" in psd_all:
-                d = psd_all["Elliptical_Mesa_PSD_Function"]
-                set_text("psd_ellipticalX", "axisx_um", d)
-                set_text("psd_ellipticalY", "axisy_um", d)
-                set_text("psd_mesaHeight", "height_um", d)
-                set_text("psd_mesaDensity", "density_um^-2", d)
-            if "Rectangular_Mesa_PSD_Function" in psd_all:
-                d = psd_all["Rectangular_Mesa_PSD_Function"]
-                set_text("psd_rectLenX", "lengthx_um", d)
-                set_text("psd_rectLenY", "lengthy_um", d)
-                set_text("psd_rectHeight", "height_um", d)
-                set_text("psd_rectDensity", "density_um^-2", d)
-            if "Triangular_Mesa_PSD_Function" in psd_all:
-                d = psd_all["Triangular_Mesa_PSD_Function"]
-                set_text("psd_triSide", "side_um", d)
-                set_text("psd_triHeight", "height_um", d)
-                set_text("psd_triDensity", "density_um^-2", d)
-            if "Rectangular_Pyramid_PSD_Function" in psd_all:
-                d = psd_all["Rectangular_Pyramid_PSD_Function"]
-                set_text("psd_pyrLenX", "lengthx_um", d)
-                set_text("psd_pyrLenY", "lengthy_um", d)
-                set_text("psd_pyrHeight", "height_um", d)
-                set_text("psd_pyrDensity", "density_um^-2", d)
-            if "Triangular_Pyramid_PSD_Function" in psd_all:
-                d = psd_all["Triangular_Pyramid_PSD_Function"]
-                set_text("psd_tpSide", "side_um", d)
-                set_text("psd_tpHeight", "height_um", d)
-                set_text("psd_tpDensity", "density_um^-2", d)
-            if "Parabolic_Dimple_PSD_Function" in psd_all:
-                d = psd_all["Parabolic_Dimple_PSD_Function"]
-                set_text("psd_pdAxisX", "axisx_um", d)
-                set_text("psd_pdAxisY", "axisy_um", d)
-                set_text("psd_pdHeight", "height_um", d)
-                set_text("psd_pdDensity", "density_um^-2", d)
+            for psd, fields in self.PSD_FIELD_MAP.items():
+                d = psd_all.get(psd)
+                if d is None:
+                    continue
+                for key, name in fields.items():
+                    set_text(name, key, d)
         except Exception:
             pass
 
-        return True
-
     # simple JSON helpers
     def save_to_json(self, path: str):
-        import json, pathlib
         data = self.to_params()
         data.setdefault("_schema", {"program": "BRDFProg", "version": 1})
-        pathlib.Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+        Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
 
     def load_from_json(self, path: str):
-        import json, pathlib
-        data = json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
         self.from_params(data)
 
 
@@ -1309,6 +1655,7 @@ class BRDFForm(QWidget):
 
     def open_last_output(self):
         """Open last output using CSV if available (table-only, like Mie)."""
+        self._ensure_built()
         data_dir = os.path.join("..", "DATA")
 
         # Prefer CSV companion of last stdout path
@@ -1319,34 +1666,26 @@ class BRDFForm(QWidget):
             if os.path.exists(guess_csv):
                 csv_path = guess_csv
 
-        # If no CSV yet, pick the most recent brdf_output_*.csv
+        # If no CSV yet, take the newest indexed run; failing that, pick the
+        # most recent brdf_output_*.csv, else the latest TXT for best effort
+        # parsing (one directory pass for both)
         if csv_path is None:
-            try:
-                cand = [os.path.join(data_dir, f) for f in os.listdir(data_dir)
-                        if f.startswith("brdf_output_") and f.endswith(".csv")]
-                csv_path = max(cand, key=os.path.getmtime) if cand else None
-            except Exception:
-                csv_path = None
-
-        # If still no CSV, fallback to latest TXT for best effort parsing
-        if csv_path is None:
-            try:
-                cand_txt = [os.path.join(data_dir, f) for f in os.listdir(data_dir)
-                            if f.startswith("brdf_output_") and f.endswith(".txt")]
-                txt_path = max(cand_txt, key=os.path.getmtime) if cand_txt else None
-            except Exception:
-                txt_path = None
+            run = self._latest_indexed_run(data_dir)
+            if run is not None:
+                csv_path, txt_path = run["csv"], run["txt"]
+            else:
+                latest = _newest_files(data_dir, "brdf_output_", (".csv", ".txt"))
+                csv_path = latest.get(".csv")
+                if csv_path is None:
+                    txt_path = latest.get(".txt")
 
-        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem
-        import csv as _csv
-        import re as _re
 
         def _populate_table_from_rows(header, rows):
             dlg = QDialog(self)
             dlg.setWindowTitle(f"Output Table: {os.path.basename(csv_path or txt_path)}")
             layout = QVBoxLayout(dlg)
             table = QTableWidget(dlg)
-            if header and rows:
+            if header and len(rows):
                 table.setColumnCount(len(header))
                 table.setRowCount(len(rows))
                 table.setHorizontalHeaderLabels(header)
@@ -1369,16 +1708,16 @@ class BRDFForm(QWidget):
 
         try:
             with open(csv_path, "r", encoding="utf-8", errors="ignore", newline="") as f:
-                reader = _csv.reader(f)
+                reader = csv.reader(f)
                 rows = [row for row in reader if row]
             if rows:
-                ncol = max(len(r) for r in rows)
+                norm_rows = _pad_rows(rows)
+                ncol = norm_rows.shape[1]
                 header = []
                 if meta and meta.get("header_tokens"):
                     header = [str(tok) for tok in meta.get("header_tokens", [])][:ncol]
                 if len(header) < ncol:
                     header.extend([f"C{i+1}" for i in range(len(header), ncol)])
-                norm_rows = [r + [""]*(ncol-len(r)) for r in rows]
                 return _populate_table_from_rows(header, norm_rows)
         except Exception as e:
             self.output_box.append(f"CSV read failed, falling back to TXT: {e}")
@@ -1397,22 +1736,16 @@ class BRDFForm(QWidget):
         header = None
         rows = []
 
-        def _is_num(t: str) -> bool:
-            try:
-                float(t.replace("D", "E").replace("d", "e"))
-                return True
-            except Exception:
-                return False
-
         # Strategy: find first header-like line; then collect ALL following numeric lines (until non-numeric chunk)
         start_idx = None
         for i, line in enumerate(lines):
-            toks = _re.split(r"\s+", line.strip())
-            if not toks or all(not t for t in toks):
+            s = line.strip()
+            if not s:
                 continue
-            # header = any token contains alpha
-            if any(_re.search(r"[A-Za-z]", t) for t in toks):
-                header = toks
+            # header = any token contains alpha; a leading letter settles it
+            # without searching the rest of the line
+            if s[0] in _LETTERS or _ALPHA.search(s):
+                header = s.split()
                 start_idx = i + 1
                 break
 
@@ -1428,8 +1761,8 @@ class BRDFForm(QWidget):
                             best_block = current
                         current = []
                     continue
-                parts = _re.split(r"\s+", s)
-                if parts and all(_is_num(x) for x in parts):
+                parts = s.split() if s[0] in _NUM_STARTS else None
+                if parts and all(_NUM.match(x) for x in parts):
                     current.append(parts)
                 else:
                     if current:
@@ -1439,9 +1772,8 @@ class BRDFForm(QWidget):
             if current and len(current) > len(best_block):
                 best_block = current
             if best_block:
-                ncol = max(len(r) for r in best_block)
-                header = [f"C{i+1}" for i in range(ncol)]
-                rows = [r + [""]*(ncol-len(r)) for r in best_block]
+                rows = _pad_rows(best_block)
+                header = [f"C{i+1}" for i in range(rows.shape[1])]
             return _populate_table_from_rows(header, rows)
 
         # With header found, collect ALL subsequent numeric lines
@@ -1451,8 +1783,8 @@ class BRDFForm(QWidget):
             if not s:
                 i += 1
                 continue
-            parts = _re.split(r"\s+", s)
-            if parts and all(_is_num(x) for x in parts):
+            parts = s.split() if s[0] in _NUM_STARTS else None
+            if parts and all(_NUM.match(x) for x in parts):
                 rows.append(parts)
                 i += 1
                 continue
@@ -1462,8 +1794,8 @@ class BRDFForm(QWidget):
 
         # Normalize columns
         if rows:
-            ncol = max(len(r) for r in rows)
-            rows = [r + [""]*(ncol-len(r)) for r in rows]
+            rows = _pad_rows(rows)
+            ncol = rows.shape[1]
             if (not header or not any(header)) and meta and meta.get("header_tokens"):
                 header = [str(tok) for tok in meta.get("header_tokens", [])][:ncol]
                 if len(header) < ncol:
@@ -1473,24 +1805,38 @@ class BRDFForm(QWidget):
 
     def open_last_input(self):
         """Open last input deck as plain text."""
+        self._ensure_built()
         data_dir = os.path.join("..", "DATA")
         path = getattr(self, "last_input_path", None)
         if not path or not os.path.exists(path):
-            try:
-                cand = [os.path.join(data_dir, f) for f in os.listdir(data_dir) if f.startswith("brdf_input_") and f.endswith(".txt")]
-                path = max(cand, key=os.path.getmtime) if cand else None
-            except Exception:
-                path = None
+            run = self._latest_indexed_run(data_dir)
+            if run is not None and run["input"] and os.path.exists(run["input"]):
+                path = run["input"]
+            else:
+                # Rescan only when the directory itself has changed
+                try:
+                    dir_mtime = os.stat(data_dir).st_mtime_ns
+                except OSError:
+                    dir_mtime = None
+                scan = self._last_input_scan
+                if scan is not None and dir_mtime is not None and scan[0] == dir_mtime and scan[1]:
+                    path = scan[1]
+                else:
+                    path = _newest_files(data_dir, "brdf_input_", (".txt",)).get(".txt")
+                    self._last_input_scan = (dir_mtime, path)
         if not path:
             self.output_box.append("No BRDF input file found in ../DATA.")
             return
-        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTextEdit
         dlg = QDialog(self)
         dlg.setWindowTitle(f"Input: {os.path.basename(path)}")
         layout = QVBoxLayout(dlg)
         txt = QTextEdit(dlg)
         txt.setReadOnly(True)
-        txt.setPlainText(open(path, "r", encoding="utf-8", errors="ignore").read())
+        with open(path, "r", encoding="utf-8", errors="ignore") as fh:
+            text = fh.read(_INPUT_VIEW_LIMIT)
+            if fh.read(1):
+                text += "\n... (truncated)"
+        txt.setPlainText(text)
         layout.addWidget(txt)
         dlg.resize(700, 500)
         dlg.exec_()
\ No newline at end of file
@@ -1,45 +1,91 @@
 from __future__ import annotations
+import array
+import functools
+import itertools
 import math
+import mmap
+import os
 import re
 from pathlib import Path
 from typing import Optional, Tuple, List
 import numpy as np
-from matplotlib.ticker import LogLocator, MultipleLocator, AutoMinorLocator
+
+# Fortran exponents (1.0D-03) become E, commas become blanks
+_NUMERIC_FIX = bytes.maketrans(b"Dd,", b"EE ")
+
+# dtype of parsed tables. BRDF values span many decades and are usually
+# drawn on a log axis, so they keep full double precision: float32 would
+# flush values below ~1e-38 to zero and keep only ~7 significant digits
+_PRECISION = np.float64
+
+# Header tokens that mark a scattering-angle column / a geometry column
+_X_HEADER_RE = re.compile(r"theta_[rs]|thetas|scatter|scatt|view")
+_GEOM_HEADER_RE = re.compile(r"theta_i|thetai|incident|azimuth|phi|rotation|lambda|wavelength|index|type")
+
+
+def _data_lines(mm: mmap.mmap):
+    """Yield normalised, non-blank, non-comment lines from the start of mm."""
+    mm.seek(0)
+    for raw in iter(mm.readline, b""):
+        line = raw.translate(_NUMERIC_FIX)
+        stripped = line.strip()
+        if stripped and not stripped.startswith(b"#"):
+            yield line
+
 
 def _load_numeric_table(csv_path: str) -> np.ndarray:
 
-    rows: List[List[float]] = []
     path = Path(csv_path)
     if not path.exists():
         raise FileNotFoundError(f"No such file: {csv_path}")
-        
-    with path.open("r", encoding="utf-8", errors="ignore") as handle:
-        for raw in handle:
-            line = raw.strip()
-            if not line or line.startswith("#"):
-                continue
-            tokens = [tok for tok in re.split(r"[\s,]+", line) if tok]
-            if not tokens:
-                continue
-            row: List[float] = []
-            for tok in tokens:
-                cleaned = tok.replace("D", "E").replace("d", "E")
+
+    # The file is mapped rather than read so large outputs are paged in on
+    # demand and never held as one Python string.
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            raise ValueError("No numeric rows detected in BRDF output.")
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Rectangular, all-numeric tables (the usual case) go through
+            # numpy in one call; text lines or ragged rows fall back to the
+            # per-line scan.
+            lines = _data_lines(mm)
+            first = next(lines, None)
+            if first is not None:
                 try:
-                    row.append(float(cleaned))
+                    return np.loadtxt(itertools.chain((first,), lines), dtype=_PRECISION, ndmin=2, comments=None)
                 except ValueError:
-                    row = []
-                    break
-            if not row:
-                continue
-            rows.append(row)
+                    pass
+
+            # Parsed values go into one flat double buffer, with the
+            # per-row widths alongside, instead of a list of lists
+            buf = array.array("d")
+            lengths = array.array("l")
+            for line in _data_lines(mm):
+                try:
+                    row = [float(tok) for tok in line.split()]
+                except ValueError:
+                    continue
+                if row:
+                    buf.extend(row)
+                    lengths.append(len(row))
 
-    if not rows:
+    if not lengths:
         raise ValueError("No numeric rows detected in BRDF output.")
 
-    width = max(len(r) for r in rows)
-    table = np.full((len(rows), width), np.nan, dtype=float)
-    for idx, row in enumerate(rows):
-        table[idx, : len(row)] = row
+    # Ragged rows are padded with NaN: a boolean mask of the filled cells,
+    # in row-major order, takes the flattened values in one assignment
+    widths = np.frombuffer(lengths, dtype=np.dtype("l"))
+    values = np.frombuffer(buf, dtype=np.float64)
+    table = np.full((len(widths), int(widths.max())), np.nan, dtype=_PRECISION)
+    table[np.arange(table.shape[1]) < widths[:, None]] = values
+    return table
+
+
+@functools.lru_cache(maxsize=8)
+def _load_cached(csv_path: str, mtime_ns: int, size: int) -> np.ndarray:
+    """_load_numeric_table keyed on the file's mtime and size; the result is read-only."""
+    table = _load_numeric_table(csv_path)
+    table.setflags(write=False)
     return table
 
 
@@ -55,8 +101,15 @@ def plot_csv(
     meta: Optional[dict] = None,
 ) -> None:
     """Render BRDF vs scattering angle on the provided Matplotlib axis."""
-
-    data = _load_numeric_table(csv_path)
+    # Imported here so loading this module (and its table reader) does not
+    # pull in matplotlib
+    from matplotlib.ticker import LogLocator, MultipleLocator, AutoMinorLocator
+
+    try:
+        st = os.stat(csv_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No such file: {csv_path}") from None
+    data = _load_cached(str(csv_path), st.st_mtime_ns, st.st_size)
     ncols = data.shape[1]
 
     header_tokens = []
@@ -72,11 +125,13 @@ def plot_csv(
             if math.isfinite(lo_hint) and math.isfinite(hi_hint):
                 x_span_hint = (lo_hint, hi_hint)
 
-    header_lower: List[str] = []
-    if header_tokens:
-        header_lower = [str(tok).strip().lower() for tok in header_tokens]
-    while len(header_lower) < ncols:
-        header_lower.append("")
+    # Header classification, once per column
+    names = [str(tok).strip().lower() for tok in header_tokens[:ncols]]
+    names += [""] * (ncols - len(names))
+    is_x_hdr = np.array([bool(_X_HEADER_RE.search(n)) for n in names], dtype=bool)
+    is_geom_hdr = np.array([bool(_GEOM_HEADER_RE.search(n)) for n in names], dtype=bool)
+    has_angle = np.array(["angle" in n for n in names], dtype=bool)
+    has_phi = np.array(["phi" in n or "azimuth" in n for n in names], dtype=bool)
 
     def _select_x_column() -> int:
         if x_col is not None and 0 <= x_col < ncols:
@@ -89,47 +144,36 @@ def plot_csv(
             exp_min = min(expected_start, expected_end)
             exp_max = max(expected_start, expected_end)
 
-        best_idx = None
-        best_score = -float("inf")
-        for idx in range(ncols):
-            col = data[:, idx]
-            finite = col[np.isfinite(col)]
-            if finite.size < 3:
-                continue
-            spread = float(np.max(finite) - np.min(finite))
-            if spread < 1e-6:
-                continue
-
-            diffs = np.diff(finite)
-            if diffs.size:
-                inc = np.mean(diffs >= -1e-8)
-                dec = np.mean(diffs <= 1e-8)
-                monotonic = max(inc, dec)
-            else:
-                monotonic = 0.0
-
-            header_score = 0.0
-            name = header_lower[idx]
-            if name:
-                if any(key in name for key in ("theta_r", "theta_s", "thetas", "scatter", "scatt", "view")):
-                    header_score += 2.5
-                if "angle" in name:
-                    header_score += 0.5
-                if "phi" in name or "azimuth" in name:
-                    header_score -= 1.0
-
-            range_score = min(spread / 180.0, 1.0)
-            closeness = 0.0
+        # Per-column statistics over the finite entries, all columns at once
+        finite = np.isfinite(data)
+        counts = finite.sum(axis=0)
+        lo = np.where(finite, data, np.inf).min(axis=0)
+        hi = np.where(finite, data, -np.inf).max(axis=0)
+        spread = hi - lo
+
+        # Differences between consecutive finite values: move each column's
+        # finite entries to the top (keeping their order) and diff downwards
+        packed = np.take_along_axis(data, np.argsort(~finite, axis=0, kind="stable"), axis=0)
+        diffs = np.diff(packed, axis=0)
+        valid = np.arange(diffs.shape[0])[:, None] < (counts - 1)
+        ndiffs = np.maximum(counts - 1, 1)
+        inc = ((diffs >= -1e-8) & valid).sum(axis=0) / ndiffs
+        dec = ((diffs <= 1e-8) & valid).sum(axis=0) / ndiffs
+        monotonic = np.where(counts > 1, np.maximum(inc, dec), 0.0)
+
+        header_score = 2.5 * is_x_hdr + 0.5 * has_angle - 1.0 * has_phi
+
+        with np.errstate(invalid="ignore", over="ignore"):
+            range_score = np.minimum(spread / 180.0, 1.0)
+            closeness = np.zeros(ncols)
             if exp_min is not None and exp_max is not None and exp_max > exp_min:
-                lo_val = float(np.min(finite))
-                hi_val = float(np.max(finite))
                 denom = max(exp_max - exp_min, 1e-6)
-                closeness = 1.0 - ((abs(lo_val - exp_min) + abs(hi_val - exp_max)) / (2.0 * denom))
+                closeness = 1.0 - ((np.abs(lo - exp_min) + np.abs(hi - exp_max)) / (2.0 * denom))
 
             score = 1.8 * monotonic + range_score + header_score + closeness
-            if score > best_score:
-                best_score = score
-                best_idx = idx
+            eligible = (counts >= 3) & (spread >= 1e-6)
+
+        best_idx = int(np.argmax(np.where(eligible, score, -np.inf))) if eligible.any() else None
 
         if best_idx is None:
             fallback = 2 if ncols > 2 else ncols - 1
@@ -140,39 +184,25 @@ def plot_csv(
         if y_col is not None and 0 <= y_col < ncols:
             return [int(y_col)]
 
-        geometry_keys = (
-            "theta_i",
-            "thetai",
-            "incident",
-            "azimuth",
-            "phi",
-            "rotation",
-            "lambda",
-            "wavelength",
-            "index",
-            "type",
-        )
-
         x_vals = data[:, x_idx]
-        mask_x = np.isfinite(x_vals)
+        mask = np.isfinite(data) & np.isfinite(x_vals)[:, None]
+        counts = mask.sum(axis=0)
+        safe_counts = np.maximum(counts, 1)
+        with np.errstate(invalid="ignore", over="ignore"):
+            spread = np.where(mask, data, -np.inf).max(axis=0) - np.where(mask, data, np.inf).min(axis=0)
+            # Columns that merely repeat x (np.allclose over the shared rows)
+            close = np.abs(data - x_vals[:, None]) <= 1e-4 + 1e-5 * np.abs(x_vals[:, None])
+            same_as_x = np.all(close | ~mask, axis=0)
+            mean = np.where(mask, data, 0.0).sum(axis=0) / safe_counts
+            std = np.sqrt(np.where(mask, (data - mean) ** 2, 0.0).sum(axis=0) / safe_counts)
+
         candidates: List[Tuple[int, float]] = []
         for idx in range(ncols):
-            if idx == x_idx:
+            if idx == x_idx or counts[idx] < 2 or same_as_x[idx] or spread[idx] < 1e-12:
                 continue
-            col = data[:, idx]
-            mask = mask_x & np.isfinite(col)
-            if mask.sum() < 2:
+            if is_geom_hdr[idx]:
                 continue
-            vals = col[mask]
-            if np.allclose(vals, x_vals[mask], rtol=1e-5, atol=1e-4):
-                continue
-            spread = float(np.max(vals) - np.min(vals))
-            if spread < 1e-12:
-                continue
-            name = header_lower[idx]
-            if name and any(key in name for key in geometry_keys):
-                continue
-            candidates.append((idx, float(np.nanstd(vals))))
+            candidates.append((idx, float(std[idx])))
 
         if not candidates:
             fallback = ncols - 1
@@ -184,23 +214,36 @@ def plot_csv(
         candidates.sort(key=lambda item: item[1], reverse=True)
         return [idx for idx, _ in candidates]
 
-    x_idx = _select_x_column()
-    measure_indices = _select_measure_columns(x_idx)
+    if x_col is not None and y_col is not None and 0 <= x_col < ncols and 0 <= y_col < ncols:
+        # Manual selection: no column heuristics needed
+        x_idx = int(x_col)
+        measure_indices = [int(y_col)]
+    else:
+        x_idx = _select_x_column()
+        measure_indices = _select_measure_columns(x_idx)
     if not measure_indices:
         raise ValueError("No measurement columns available for plotting.")
 
-    xs = data[:, x_idx]
-    base_mask = np.isfinite(xs)
+    # Rows with a finite x, sorted by x once for every curve; missing y
+    # values stay in place as NaN and show up as gaps in the line.
+    # SCATMECH writes scans in order, so usually no sort is needed.
+    rows = data[np.isfinite(data[:, x_idx])]
+    steps = np.diff(rows[:, x_idx])
+    if np.all(steps < 0):
+        rows = rows[::-1]
+    elif not np.all(steps >= 0):
+        rows = rows[np.argsort(rows[:, x_idx], kind="stable")]
+    xs_sorted = rows[:, x_idx]
+    finite_rows = np.isfinite(rows)
 
     valid_indices: List[int] = []
     positive_scores: List[float] = []
     for idx in measure_indices:
-        col = data[:, idx]
-        mask = base_mask & np.isfinite(col)
-        if mask.sum() == 0:
+        col_finite = finite_rows[:, idx]
+        if not col_finite.any():
             continue
         valid_indices.append(idx)
-        positive_scores.append(float(np.mean(col[mask] > 0)))
+        positive_scores.append(float(np.mean(rows[col_finite, idx] > 0)))
 
     if not valid_indices:
         raise ValueError("No finite measurement data available for plotting.")
@@ -218,21 +261,16 @@ def plot_csv(
 
     xmin = math.inf
     xmax = -math.inf
-    all_positive_values: List[float] = []
+    y_pos_min = math.inf
+    y_pos_max = -math.inf
 
+    curves: List[np.ndarray] = []
+    line_labels: List[str] = []
     for idx in valid_indices:
-        col = data[:, idx]
-        mask = base_mask & np.isfinite(col)
-        xs_vals = xs[mask]
-        ys_vals = col[mask]
-        if xs_vals.size == 0:
-            continue
-        order = np.argsort(xs_vals)
-        xs_vals = xs_vals[order]
-        ys_vals = ys_vals[order]
-
-        xmin = min(xmin, float(np.min(xs_vals)))
-        xmax = max(xmax, float(np.max(xs_vals)))
+        ys_vals = rows[:, idx]
+        xs_finite = xs_sorted[finite_rows[:, idx]]
+        xmin = min(xmin, float(xs_finite[0]))
+        xmax = max(xmax, float(xs_finite[-1]))
 
         col_label = header_names[idx] if idx < len(header_names) else ""
         if label:
@@ -244,14 +282,40 @@ def plot_csv(
             line_label = col_label or f"C{idx + 1}"
 
         if use_semilogy:
-            ys_plot = ys_vals.astype(float).copy()
+            ys_plot = ys_vals.astype(float)
             positives = ys_plot > 0
             ys_plot[~positives] = np.nan
             if positives.any():
-                all_positive_values.extend(float(val) for val in ys_plot[positives] if math.isfinite(val))
-            ax.plot(xs_vals, ys_plot, linewidth=1.4, label=line_label)
+                pos = ys_plot[positives]
+                y_pos_min = min(y_pos_min, float(pos.min()))
+                y_pos_max = max(y_pos_max, float(pos.max()))
         else:
-            ax.plot(xs_vals, ys_vals, linewidth=1.4, label=line_label)
+            ys_plot = ys_vals
+        curves.append(ys_plot)
+        line_labels.append(line_label)
+
+    legend_handles = None
+    if len(curves) == 1:
+        ax.plot(xs_sorted, curves[0], linewidth=1.4, label=line_labels[0])
+    else:
+        # Several curves share one x: draw them as a single collection and
+        # give the legend one proxy line per curve
+        from matplotlib import rcParams
+        from matplotlib.collections import LineCollection
+        from matplotlib.lines import Line2D
+
+        # Colors come from the axes' own cycle, advanced as ax.plot would
+        colors = [ax._get_lines.get_next_color() for _ in curves]
+        segments = [np.column_stack([xs_sorted, ys]) for ys in curves]
+        ax.add_collection(LineCollection(
+            segments, colors=colors, linewidths=1.4,
+            capstyle=rcParams["lines.solid_capstyle"], joinstyle=rcParams["lines.solid_joinstyle"],
+        ))
+        ax.autoscale_view()
+        legend_handles = [
+            Line2D([], [], color=color, linewidth=1.4, label=text)
+            for color, text in zip(colors, line_labels)
+        ]
 
     if not math.isfinite(xmin) or not math.isfinite(xmax):
         raise ValueError("Unable to determine X-axis bounds from data.")
@@ -273,17 +337,17 @@ def plot_csv(
     if use_semilogy:
         ax.yaxis.set_major_locator(LogLocator(base=10.0, numticks=10))
         ax.yaxis.set_minor_locator(LogLocator(base=10.0, subs=(0.2, 0.4, 0.6, 0.8), numticks=12))
-        positive_array = np.array(all_positive_values, dtype=float)
-        positive_array = positive_array[np.isfinite(positive_array)]
-        if positive_array.size:
-            ymin = float(np.min(positive_array) * 0.8)
-            ymax = float(np.max(positive_array) * 1.2)
+        if y_pos_min <= y_pos_max:
+            ymin = y_pos_min * 0.8
+            ymax = y_pos_max * 1.2
             if np.isfinite(ymin) and np.isfinite(ymax) and ymin > 0 and ymax > 0:
                 ax.set_ylim(ymin, ymax)
     else:
         ax.yaxis.set_minor_locator(AutoMinorLocator(2))
 
-    if len(valid_indices) > 1 or label:
+    if legend_handles is not None:
+        ax.legend(handles=legend_handles, loc="best")
+    elif label:
         ax.legend(loc="best")
 
     ax.grid(True, which="major", linewidth=0.8, alpha=0.6)
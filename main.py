@@ -57,7 +57,6 @@ class SCATMECHGui(QWidget):
 
         # Placeholder pages
         def placeholder(name):
-            from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
             w = QWidget(self)
             v = QVBoxLayout(w)
             v.addStretch(1)
@@ -1,26 +1,258 @@
 import os
 import re
 import csv
+import functools
 import datetime
 import subprocess
 import importlib
 import shutil
+import tempfile
+import warnings
 from pathlib import Path
 
+import numpy as np
+
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QLineEdit,
     QVBoxLayout, QHBoxLayout,
     QPushButton, QTextEdit, QGroupBox,
     QFormLayout, QFileDialog,
-    QDialog, QTableWidget, QTableWidgetItem, QSizePolicy, QMenu
+    QDialog, QTableView, QSizePolicy, QMenu
+)
+from PyQt5.QtCore import (
+    pyqtSignal, Qt, QObject, QRunnable, QThreadPool, QAbstractTableModel, QModelIndex
 )
-from PyQt5.QtCore import pyqtSignal
 
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
 scatmech_bin = str(Path.home() / "Local/ME498/SCATMECH")
-os.environ["PATH"] = scatmech_bin + os.pathsep + os.environ.get("PATH", "")
+if scatmech_bin not in os.environ.get("PATH", "").split(os.pathsep):
+    os.environ["PATH"] = scatmech_bin + os.pathsep + os.environ.get("PATH", "")
+
+# Directory of this file; mieplot.py is looked up next to it first
+_HERE = str(Path(__file__).resolve().parent)
+
+# Column separator and the table header line ("Theta Phi ..." / "Angle ...")
+_WS_RE = re.compile(r"\s+")
+_HEADER_RE = re.compile(r"\s*(?:Theta|Angle)")
+
+
+def _file_mtime(path):
+    """mtime of path, 0 if it is missing or unreadable."""
+    try:
+        return os.path.getmtime(path)
+    except (OSError, TypeError):
+        return 0
+
+
+@functools.lru_cache(maxsize=32)
+def _abs_dir(path):
+    """Absolute directory of path (the app never changes its cwd)."""
+    return os.path.dirname(os.path.abspath(path))
+
+
+def _table_row(parts):
+    """Floats of one table row's tokens; cells float() rejects become nan."""
+    try:
+        return list(map(float, parts))
+    except ValueError:
+        row = []
+        for tok in parts:
+            try:
+                row.append(float(tok))
+            except ValueError:
+                row.append(np.nan)
+        return row
+
+
+def _scan_mie_output(lines):
+    """Split mieprog's text output into (header, table, preamble).
+
+    preamble is the list of lines before the Theta/Angle header. The table
+    runs up to the first blank line or line whose first token is not a
+    number; unreadable cells are nan and short rows are padded with nan to
+    the widest row. header and table are None when no header is found.
+    Lines after the table are not consumed.
+    """
+    lines = iter(lines)
+    preamble = []
+    header = None
+    for line in lines:
+        s = line.strip()
+        if _HEADER_RE.match(s):
+            header = _WS_RE.split(s)
+            break
+        preamble.append(line.rstrip("\n"))
+    if header is None:
+        return None, None, preamble
+
+    rows = []
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            break
+        try:
+            float(parts[0])
+        except ValueError:
+            break
+        rows.append(_table_row(parts))
+
+    return header, _rows_to_table(rows), preamble
+
+
+def _rows_to_table(rows):
+    """2D float array of ragged float rows, short rows padded with nan."""
+    table = np.full((len(rows), max(map(len, rows), default=0)), np.nan)
+    for i, row in enumerate(rows):
+        table[i, :len(row)] = row
+    return table
+
+
+def _read_csv_table(path):
+    """(header, table) of a CSV with a header row; (None, None) if empty.
+
+    The body is parsed by numpy in one pass; ragged files are read row by
+    row instead. Missing or unreadable cells are nan.
+    """
+    with open(path, newline="") as f:
+        header = next(csv.reader(f), None)
+        if header is None:
+            return None, None
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                return header, np.genfromtxt(f, delimiter=",", dtype=float, filling_values=np.nan, ndmin=2)
+        except ValueError:
+            f.seek(0)
+            rows = list(csv.reader(f))[1:]
+    return header, _rows_to_table([_table_row(row) for row in rows])
+
+
+class NumpyTableModel(QAbstractTableModel):
+    """Read-only table model over a 2D array; cells are formatted (%g, blank
+    for nan) only when the view asks for them, so large outputs cost no
+    per-cell objects."""
+
+    def __init__(self, arr, header, parent=None):
+        super().__init__(parent)
+        self._arr = arr
+        self._header = list(header)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._arr.shape[0]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._header)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        if index.column() >= self._arr.shape[1]:
+            return None
+        value = self._arr[index.row(), index.column()]
+        return "" if value != value else "%g" % value
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._header[section] if section < len(self._header) else None
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if not 0 <= column < self._arr.shape[1] or not len(self._arr):
+            return
+        self.layoutAboutToBeChanged.emit()
+        idx = np.argsort(self._arr[:, column], kind="stable")
+        if order == Qt.DescendingOrder:
+            idx = idx[::-1]
+        self._arr = self._arr[idx]
+        self.layoutChanged.emit()
+
+
+class WorkerSignals(QObject):
+    # header tokens, numeric table (None if absent), text before the
+    # header, stderr, return code
+    finished = pyqtSignal(object, object, str, str, int)
+    # error message when the process could not be started
+    failed = pyqtSignal(str)
+    # path of a file written in the background
+    saved = pyqtSignal(str)
+
+
+class MieWorker(QRunnable):
+    """Run mieprog off the GUI thread, teeing stdout to stdout_txt and
+    parsing the data table as the lines arrive. The saved input deck is
+    handed to the process as its stdin."""
+
+    def __init__(self, exe, input_txt, cwd, stdout_txt):
+        super().__init__()
+        self.exe = exe
+        self.input_txt = input_txt
+        self.cwd = cwd
+        self.stdout_txt = stdout_txt
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            # stderr goes to a spool file so a chatty process cannot block on
+            # a full pipe while stdout is being read
+            with tempfile.TemporaryFile("w+", encoding="utf-8", errors="ignore") as err:
+                with open(self.input_txt, "rb") as deck:
+                    proc = subprocess.Popen(
+                        [self.exe],
+                        stdin=deck, stdout=subprocess.PIPE, stderr=err,
+                        text=True, bufsize=1, cwd=self.cwd,
+                    )
+                with proc, open(self.stdout_txt, "w", encoding="utf-8", errors="ignore") as f:
+                    lines = self._tee(proc.stdout, f)
+                    header, table, preamble = _scan_mie_output(lines)
+                    # The rest of stdout still goes to the output file
+                    for _ in lines:
+                        pass
+                    rc = proc.wait()
+                    err.seek(0)
+                    stderr = err.read()
+                    if stderr:
+                        f.write("\n--- STDERR ---\n")
+                        f.write(stderr)
+        except FileNotFoundError:
+            self.signals.failed.emit("mieprog executable not found. Check path ../SCATMECH/mieprog[.exe].")
+            return
+        except Exception as e:
+            self.signals.failed.emit(f"Error running mieprog: {e}")
+            return
+        if table is not None and not table.size:
+            table = None
+        self.signals.finished.emit(header, table, "\n".join(preamble), stderr, rc)
+
+    @staticmethod
+    def _tee(stream, f):
+        """Yield the lines of stream, copying each one to f as it arrives."""
+        for line in stream:
+            f.write(line)
+            yield line
+
+
+class CsvWriter(QRunnable):
+    """Write a parsed mieprog table to CSV off the GUI thread."""
+
+    def __init__(self, path, header, table):
+        super().__init__()
+        self.path = path
+        self.header = header
+        self.table = table
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            np.savetxt(self.path, self.table, delimiter=",", fmt="%s", header=",".join(self.header), comments="")
+        except Exception as e:
+            self.signals.failed.emit(f"Could not save CSV: {e}")
+        else:
+            self.signals.saved.emit(self.path)
+
 
 class MieForm(QWidget):
     
@@ -41,6 +273,8 @@ class MieForm(QWidget):
         # Right panel
         self.figure = Figure(figsize=(6, 5), tight_layout=True)
         self.canvas = FigureCanvas(self.figure)
+        # 3D axes reused by every plot; see _plot_axes
+        self.ax = self.figure.add_subplot(111, projection="3d")
         self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         plot_layout = QVBoxLayout()
         plot_layout.addWidget(self.canvas, 1)
@@ -82,8 +316,9 @@ class MieForm(QWidget):
         self.run_btn = QPushButton("Run MieProg")
         self.metric_menu = QMenu(self.run_btn)
         for _name in ["S11", "Pol", "S33", "S34"]:
-            act = self.metric_menu.addAction(_name)
-            act.triggered.connect(lambda checked, n=_name: self.run_with_metric(n))
+            self.metric_menu.addAction(_name)
+        # One connection for the whole menu; the action's text is the metric
+        self.metric_menu.triggered.connect(lambda act: self.run_with_metric(act.text()))
             
         self.run_btn.setMenu(self.metric_menu)
         
@@ -132,6 +367,26 @@ class MieForm(QWidget):
         # State
         self.last_stdout_path = None
         self.last_input_path = None
+        # MieWorker of the run in flight, None when idle
+        self._worker = None
+        # mieprog path, looked up on the first run; ../DATA created once
+        self._mieprog_exe = None
+        self._data_dir_ready = False
+
+        # Resolved mieplot module, its source file and that file's mtime
+        self._mieplot_mod = None
+        self._mieplot_how = None
+        self._mieplot_file = None
+        self._mieplot_mtime = 0
+        self._mieplot_setm = None
+        self._mieplot_plot = None
+        self._mieplot_table = None
+        # CsvWriter in flight, kept alive until it reports back
+        self._csv_writer = None
+        # Table of the last run as the worker parsed it, so open_last_output
+        # can show it without reading the file again:
+        # {"path", "header", "array", "note"} or None
+        self._last_parsed = None
 
     def connect_plot_clear(self, slot):
         self._plot_clear_callback = slot
@@ -156,9 +411,15 @@ class MieForm(QWidget):
         self.log.append("Plot cleared.")
 
     def run_mieprog(self):
+        if self._worker is not None:
+            self.log.append("mieprog is already running.")
+            return
+        self._last_parsed = None
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         data_dir = os.path.join("..", "DATA")
-        os.makedirs(data_dir, exist_ok=True)
+        if not self._data_dir_ready:
+            os.makedirs(data_dir, exist_ok=True)
+            self._data_dir_ready = True
         stdout_txt = os.path.join(data_dir, f"mie_output_{timestamp}.txt")
         csv_filename = os.path.join(data_dir, f"mie_output_{timestamp}.csv")
 
@@ -179,15 +440,9 @@ class MieForm(QWidget):
         rad_str    = _norm_num(p.get("radius_um", "0.05"))
         sphere_str = str(p.get("sphere_optics", "(1.59,0)")).strip()
 
-        stdin_payload = f"""{step_theta}
-{step_phi}
-{wl_str}
-{medium_str}
-{rad_str}
-{sphere_str}
-"""
+        stdin_payload = "\n".join((step_theta, step_phi, wl_str, medium_str, rad_str, sphere_str, ""))
 
-        # Save input 
+        # Save input; mieprog reads it straight from this file
         input_txt = os.path.join(data_dir, f"mie_input_{timestamp}.txt")
         with open(input_txt, "w", encoding="utf-8") as f:
             f.write(stdin_payload)
@@ -195,7 +450,9 @@ class MieForm(QWidget):
         self.log.append(f"Saved input deck: {input_txt}")
 
         # Run executable
-        exe = shutil.which("mieprog")
+        if self._mieprog_exe is None:
+            self._mieprog_exe = shutil.which("mieprog")
+        exe = self._mieprog_exe
         if not exe:
             self.log.setText(
                 "[Error] 'mieprog' not found. Ensure it is on PATH or next to the app.\n"
@@ -204,147 +461,183 @@ class MieForm(QWidget):
             return
 
         self.log.append(f"Running MieProg: {exe}")
+        worker = MieWorker(exe, input_txt, os.path.dirname(exe) if os.path.sep in exe else None, stdout_txt)
+        worker.signals.finished.connect(
+            functools.partial(self._on_mieprog_done, stdout_txt=stdout_txt, csv_filename=csv_filename)
+        )
+        worker.signals.failed.connect(self._on_mieprog_failed)
+        self._worker = worker
+        self.run_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(worker)
+
+    def _finish_worker(self):
+        self._worker = None
+        self.run_btn.setEnabled(True)
+
+    def _on_mieprog_failed(self, message):
+        self._finish_worker()
+        # Look the executable up again next time in case it moved
+        self._mieprog_exe = None
+        self.log.append(message)
+
+    def _on_mieprog_done(self, header, table, preamble, stderr, rc, stdout_txt, csv_filename):
+        """Write the CSV and plot the table of a finished mieprog run."""
+        self._finish_worker()
+        # The worker has already written the raw output
+        self.last_stdout_path = stdout_txt
         try:
-            proc = subprocess.run(
-                [exe],
-                input=stdin_payload,
-                capture_output=True, text=True, check=False,
-                cwd=os.path.dirname(exe) if os.path.sep in exe else None,
-            )
-            # Save raw output
-            with open(stdout_txt, "w", encoding="utf-8", errors="ignore") as f:
-                self.last_stdout_path = stdout_txt
-                f.write(proc.stdout or "")
-                if proc.stderr:
-                    f.write("\n--- STDERR ---\n")
-                    f.write(proc.stderr)
-
-            if proc.returncode != 0:
+            if rc != 0:
                 self.log.append("mieprog returned non-zero exit. See output text for details.")
                 return
 
-            out = proc.stdout or ""
             self.log.append("mieprog completed. Parsing output table…")
 
-            # Parse table 
-            lines = out.splitlines()
-            header_idx = None
-            header = None
-            for i, line in enumerate(lines):
-                s = line.strip()
-                if not s:
-                    continue
-                if s.startswith("Theta") or s.startswith("Angle"):
-                    header_idx = i
-                    header = re.split(r"\s+", s)
-                    break
-
-            if header_idx is None or not header:
+            if not header:
                 self.log.append("Could not find data header ('Theta Phi ...' or 'Angle ...').")
                 return
 
-            data_rows = []
-            for line in lines[header_idx+1:]:
-                if not line.strip():
-                    break
-                parts = re.split(r"\s+", line.strip())
-                try:
-                    float(parts[0]) 
-                except Exception:
-                    break
-                data_rows.append(parts)
-
-            if not data_rows:
+            if table is None or not len(table):
                 self.log.append("No data rows found in Mie output.")
                 return
 
-            # Write CSV 
-            with open(csv_filename, "w", newline="") as fcsv:
-                w = csv.writer(fcsv)
-                w.writerow(header)
-                w.writerows(data_rows)
-            self.log.append(f"Saved CSV: {csv_filename}")
-
-            self.render_with_external(csv_filename)
+            self._last_parsed = {
+                "path": stdout_txt, "header": header, "array": table,
+                "note": preamble or "(No preamble)",
+            }
+
+            # Plot straight from the parsed table when mieplot can, and
+            # archive the CSV in the background; otherwise plot from the CSV
+            if self._resolve_mieplot(csv_filename) and callable(self._mieplot_table):
+                writer = CsvWriter(csv_filename, header, table)
+                writer.signals.saved.connect(self._on_csv_saved)
+                writer.signals.failed.connect(self._on_csv_failed)
+                self._csv_writer = writer
+                QThreadPool.globalInstance().start(writer)
+                self.render_with_external(csv_filename, table=(header, table))
+            else:
+                # Write CSV 
+                np.savetxt(csv_filename, table, delimiter=",", fmt="%s", header=",".join(header), comments="")
+                self.log.append(f"Saved CSV: {csv_filename}")
+                self.render_with_external(csv_filename)
 
-        except FileNotFoundError:
-            self.log.append("mieprog executable not found. Check path ../SCATMECH/mieprog[.exe].")
         except Exception as e:
             self.log.append(f"Error running mieprog: {e}")
 
+    def _on_csv_saved(self, path):
+        self._csv_writer = None
+        self.log.append(f"Saved CSV: {path}")
+
+    def _on_csv_failed(self, message):
+        self._csv_writer = None
+        self.log.append(message)
+
         # External plot module connection
-    def render_with_external(self, csv_path: str):
-       
+    def _resolve_mieplot(self, csv_path):
+        """Load mieplot (cached until its file changes); False if it cannot be found."""
         import sys, os, importlib, importlib.util
 
-        # Prepare axes
-        self.figure.clear()
-        ax = self.figure.gca()
-
-        here = os.path.dirname(os.path.abspath(__file__))
-        cwd  = os.getcwd()
-        csv_dir = os.path.dirname(os.path.abspath(csv_path)) if csv_path else None
+        # mieplot is resolved once and reused until its source file changes
+        mod = self._mieplot_mod
+        if mod is not None and _file_mtime(self._mieplot_file) != self._mieplot_mtime:
+            sys.modules.pop("mieplot", None)
+            mod = None
 
-        tried = []
+        if mod is None:
+            here = _HERE
+            cwd  = os.getcwd()
+            csv_dir = _abs_dir(csv_path) if csv_path else None
 
-        def _try_normal(name):
-            try:
-                mod = importlib.import_module(name)
-                return mod, f"import {name}"
-            except Exception as e:
-                tried.append(f"import {name}: {e}")
-                return None, None
+            tried = []
 
-        def _try_file(path):
-            try:
-                if path and os.path.exists(path):
-                    spec = importlib.util.spec_from_file_location("mieplot", path)
-                    if spec and spec.loader:
-                        mod = importlib.util.module_from_spec(spec)
-                        sys.modules["mieplot"] = mod
-                        spec.loader.exec_module(mod)
-                        return mod, f"load {path}"
-            except Exception as e:
-                tried.append(f"load {path}: {e}")
-            return None, None
+            def _try_normal(name):
+                try:
+                    mod = importlib.import_module(name)
+                    return mod, f"import {name}"
+                except Exception as e:
+                    tried.append(f"import {name}: {e}")
+                    return None, None
 
-        # check 
-        if here not in sys.path:
-            sys.path.insert(0, here)
+            def _try_file(path):
+                try:
+                    if path and os.path.exists(path):
+                        spec = importlib.util.spec_from_file_location("mieplot", path)
+                        if spec and spec.loader:
+                            mod = importlib.util.module_from_spec(spec)
+                            sys.modules["mieplot"] = mod
+                            spec.loader.exec_module(mod)
+                            return mod, f"load {path}"
+                except Exception as e:
+                    tried.append(f"load {path}: {e}")
+                return None, None
 
-        # check
-        mod, how = _try_normal("mieplot")
+            # check 
+            if here not in sys.path:
+                sys.path.insert(0, here)
+
+            # check
+            mod, how = _try_normal("mieplot")
+
+            if mod is None:
+                mod, how = _try_file(os.path.join(here, "mieplot.py"))
+            if mod is None:
+                mod, how = _try_file(os.path.join(cwd, "mieplot.py"))
+            if mod is None and csv_dir:
+                mod, how = _try_file(os.path.join(csv_dir, "mieplot.py"))
+
+            if mod is None:
+                self.log.append("Could not import mieplot.py: " + " | ".join(tried))
+                return False
+
+            self._mieplot_mod = mod
+            self._mieplot_how = how
+            self._mieplot_file = getattr(mod, "__file__", None)
+            self._mieplot_mtime = _file_mtime(self._mieplot_file)
+            self._mieplot_setm = getattr(mod, "set_metric", None)
+            self._mieplot_plot = getattr(mod, "plot_csv", None)
+            self._mieplot_table = getattr(mod, "plot_table", None)
+        return True
+
+    def _plot_axes(self):
+        """Return the 3D plot axes; recreated only after clear_plot."""
+        if self.ax not in self.figure.axes:
+            self.figure.clear()
+            self.ax = self.figure.add_subplot(111, projection="3d")
+        return self.ax
 
-        if mod is None:
-            mod, how = _try_file(os.path.join(here, "mieplot.py"))
-        if mod is None:
-            mod, how = _try_file(os.path.join(cwd, "mieplot.py"))
-        if mod is None and csv_dir:
-            mod, how = _try_file(os.path.join(csv_dir, "mieplot.py"))
+    def render_with_external(self, csv_path: str, table=None):
+        """Plot csv_path with mieplot; table=(header, data) plots the parsed
+        run directly instead of re-reading the CSV."""
+        # Prepare axes
+        ax = self._plot_axes()
 
-        if mod is None:
-            self.log.append("Could not import mieplot.py: " + " | ".join(tried))
+        if not self._resolve_mieplot(csv_path):
             self.canvas.draw()
             return
-        else:
-            self.log.append(f"mieplot resolved via: {how}")
+        self.log.append(f"mieplot resolved via: {self._mieplot_how}")
 
-        setm = getattr(mod, "set_metric", None)
+        setm = self._mieplot_setm
         if callable(setm):
             try:
                 setm(getattr(self, "metric_name", "S11"))
             except Exception as e:
                 self.log.append("Warning: could not set metric on mieplot: {e}")
-        fn = getattr(mod, "plot_csv", None)
+        if table is not None and callable(self._mieplot_table):
+            fn, fn_name, args = self._mieplot_table, "plot_table", table
+        else:
+            fn, fn_name, args = self._mieplot_plot, "plot_csv", (csv_path,)
         if not callable(fn):
             self.log.append("mieplot.py found, but it must define plot_csv(ax, csv_path).")
             self.canvas.draw()
             return
 
         try:
-            fn(ax, csv_path)
+            info = fn(ax, *args)
             self.canvas.draw()
-            self.log.append("Plot updated via mieplot.plot_csv")
+            self.log.append(f"Plot updated via mieplot.{fn_name}")
+            if isinstance(info, dict) and info.get("stride", 1) > 1:
+                self.log.append(
+                    f"Showing {info['points']} of {info['total']} points (every {info['stride']}th)."
+                )
         except Exception as e:
             self.log.append(f"mieplot render error: {e}")
             self.canvas.draw()
@@ -377,11 +670,13 @@ class MieForm(QWidget):
 
     # Viewers 
     def _find_latest(self, prefix: str, folder: str):
+        # DirEntry caches its stat result, so each candidate is stat'ed once
         try:
-            paths = [os.path.join(folder, f) for f in os.listdir(folder) if f.startswith(prefix)]
-            if not paths:
+            with os.scandir(folder) as it:
+                entries = [e for e in it if e.name.startswith(prefix)]
+            if not entries:
                 return None
-            return max(paths, key=lambda p: os.path.getmtime(p))
+            return max(entries, key=lambda e: e.stat().st_mtime).path
         except Exception:
             return None
 
@@ -392,8 +687,31 @@ class MieForm(QWidget):
         except Exception as e:
             return f"(Could not open file: {e})"
 
+    def _parse_to_array(self, path):
+        """Return (header, table, note) for a Mie output file.
+
+        CSVs are read with their first row as the header; text output is
+        scanned once for the Theta/Angle header and the numeric block after
+        it. Either way the table is a float array (nan for unreadable cells).
+        note is what the dialog shows above the table: the text preamble, or
+        the whole text when no header was found (header and table are then
+        None).
+        """
+        if path.lower().endswith(".csv"):
+            header, arr = _read_csv_table(path)
+            if header is None:
+                return None, None, "(Empty CSV)"
+            return header, arr, ""
+
+        text = self._read_file(path)
+        # Same scan as the worker's, so the cached table of a run and a
+        # re-parse of its output file agree
+        header, arr, pre = _scan_mie_output(text.splitlines())
+        if header is None:
+            return None, None, text
+        return header, arr, "\n".join(pre) or "(No preamble)"
+
     def open_last_output(self):
-        import csv as _csv
         data_dir = os.path.join("..", "DATA")
         path = getattr(self, "last_stdout_path", None)
         if not path or not os.path.exists(path):
@@ -411,7 +729,7 @@ class MieForm(QWidget):
         txt.setMinimumHeight(120)
         layout.addWidget(txt)
 
-        table = QTableWidget(dlg)
+        table = QTableView(dlg)
         table.setMinimumHeight(320)
         layout.addWidget(table)
 
@@ -422,60 +740,24 @@ class MieForm(QWidget):
         layout.addLayout(btn_row)
         close_btn.clicked.connect(dlg.accept)
 
-        _, ext = os.path.splitext(path)
-        ext = (ext or "").lower()
-        if ext == ".csv":
-            try:
-                with open(path, newline="") as f:
-                    rows = list(_csv.reader(f))
-                if not rows:
-                    txt.setPlainText("(Empty CSV)")
-                else:
-                    header, data = rows[0], rows[1:]
-                    table.setColumnCount(len(header))
-                    table.setRowCount(len(data))
-                    table.setHorizontalHeaderLabels(header)
-                    for r, row in enumerate(data):
-                        for c, val in enumerate(row):
-                            table.setItem(r, c, QTableWidgetItem(val))
-                    table.setSortingEnabled(True)
-                    table.resizeColumnsToContents()
-                    txt.setPlainText("")
-            except Exception as e:
-                txt.setPlainText(f"(Failed to open CSV: {e})")
-        else:
-            text = self._read_file(path)
-            lines = text.splitlines()
-            header_idx = None
-            for i, line in enumerate(lines):
-                s = line.strip()
-                if s.startswith("Theta") or s.startswith("Angle"):
-                    header_idx = i
-                    break
-            pre = "\n".join(lines[:header_idx]) if header_idx not in (None, 0) else ""
-            txt.setPlainText(pre if pre else "(No preamble)")
-            if header_idx is not None:
-                header = re.split(r"\s+", lines[header_idx].strip())
-                data_rows = []
-                for line in lines[header_idx+1:]:
-                    if not line.strip():
-                        break
-                    parts = re.split(r"\s+", line.strip())
-                    try:
-                        float(parts[0])
-                    except Exception:
-                        break
-                    data_rows.append(parts)
-                table.setColumnCount(len(header))
-                table.setRowCount(len(data_rows))
-                table.setHorizontalHeaderLabels(header)
-                for r, row in enumerate(data_rows):
-                    for c, val in enumerate(row):
-                        table.setItem(r, c, QTableWidgetItem(val))
-                table.setSortingEnabled(True)
-                table.resizeColumnsToContents()
+        def _fill_table(header, arr):
+            table.setModel(NumpyTableModel(arr, header, table))
+            # Rows start in file order; clicking a header sorts
+            table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+            table.setSortingEnabled(True)
+            table.resizeColumnsToContents()
+
+        cached = self._last_parsed
+        try:
+            if cached and cached["path"] == path:
+                header, arr, note = cached["header"], cached["array"], cached["note"]
             else:
-                txt.setPlainText(text)
+                header, arr, note = self._parse_to_array(path)
+        except Exception as e:
+            header, arr, note = None, None, f"(Failed to open {os.path.basename(path)}: {e})"
+        txt.setPlainText(note)
+        if header is not None:
+            _fill_table(header, arr)
 
         dlg.resize(900, 700)
         dlg.exec_()
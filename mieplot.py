@@ -2,16 +2,25 @@ from __future__ import annotations
 
 import csv
 import math
+import warnings
 from typing import List, Tuple, Optional
 
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D  
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy path is used without it
+    njit = None
+
 
 # Metric selection
 _METRIC_NAME = "S11"  # default
 
+# Scatter plots above this many points are decimated with a uniform stride
+_MAX_POINTS = 20000
+
 
 def set_metric(name: str) -> None:
     global _METRIC_NAME
@@ -27,27 +36,35 @@ def get_metric() -> str:
 
 
 # CSV parsing 
-def _read_csv(csv_path: str) -> Tuple[List[str], List[List[str]]]:
+def _read_csv(csv_path: str) -> Tuple[List[str], np.ndarray]:
     with open(csv_path, newline="") as f:
-        rows = list(csv.reader(f))
-    if not rows or len(rows) < 2:
+        header = next(csv.reader(f), None)
+        if header is None:
+            raise ValueError("CSV appears empty.")
+        # Whole table in one numpy pass; missing or non-numeric cells are NaN
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                data = np.genfromtxt(f, delimiter=",", dtype=float, filling_values=np.nan, ndmin=2)
+        except ValueError:
+            data = None
+        if data is None:
+            # Ragged rows: convert cell by cell, padding short rows with NaN
+            f.seek(0)
+            rows = list(csv.reader(f))[1:]
+            data = np.full((len(rows), max(map(len, rows), default=0)), np.nan)
+            for i, row in enumerate(rows):
+                for j, cell in enumerate(row):
+                    try:
+                        data[i, j] = float(cell)
+                    except ValueError:
+                        pass
+    if len(data) == 0:
         raise ValueError("CSV appears empty.")
-    header = rows[0]
-    data = rows[1:]
     return header, data
 
 
-def _to_float_list(col: List[str]) -> np.ndarray:
-    vals = []
-    for s in col:
-        try:
-            vals.append(float(s))
-        except Exception:
-            vals.append(np.nan)
-    return np.array(vals, dtype=float)
-
-
-def _extract_columns(header: List[str], data: List[List[str]]) -> Tuple[np.ndarray, np.ndarray, dict]:
+def _extract_columns(header: List[str], data: np.ndarray) -> Tuple[np.ndarray, np.ndarray, dict]:
     
     # normalize header
     h = [c.strip() for c in header]
@@ -63,7 +80,7 @@ def _extract_columns(header: List[str], data: List[List[str]]) -> Tuple[np.ndarr
     cols = {}
     for key, idx in colmap.items():
         if idx is not None:
-            cols[key] = _to_float_list([row[idx] if idx < len(row) else "" for row in data])
+            cols[key] = data[:, idx] if idx < data.shape[1] else np.full(len(data), np.nan)
 
     # theta/phi values
     if colmap["theta"] is not None:
@@ -92,18 +109,58 @@ def _sph_to_cart(theta_deg: np.ndarray, phi_deg: np.ndarray) -> Tuple[np.ndarray
     """r=1 conversion."""
     th = np.radians(theta_deg)
     ph = np.radians(phi_deg)
-    x = np.sin(th) * np.cos(ph) 
-    y = np.sin(th) * np.sin(ph)
-    z = np.cos(th)
+    sth = np.sin(th)
+    x = sth * np.cos(ph)
+    y = np.multiply(sth, np.sin(ph), out=sth)
+    z = np.cos(th, out=th)
     return x, y, z
 
 
+# Fused filter + conversion for large grids (numba only)
+if njit is not None:
+    @njit(cache=True)
+    def _fused_pipeline(theta_deg, phi_deg, cvals):
+        """Drop non-finite rows and convert to Cartesian in one pass."""
+        n = theta_deg.size
+        out_x = np.empty(n)
+        out_y = np.empty(n)
+        out_z = np.empty(n)
+        out_c = np.empty(n)
+        deg = np.pi / 180.0
+        k = 0
+        for i in range(n):
+            t = theta_deg[i]
+            p = phi_deg[i]
+            c = cvals[i]
+            if np.isfinite(t) and np.isfinite(p) and np.isfinite(c):
+                t *= deg
+                p *= deg
+                sth = np.sin(t)
+                out_x[k] = sth * np.cos(p)
+                out_y[k] = sth * np.sin(p)
+                out_z[k] = np.cos(t)
+                out_c[k] = c
+                k += 1
+        return out_x[:k], out_y[:k], out_z[:k], out_c[:k]
+else:
+    _fused_pipeline = None
+
+# Below this many points the NumPy path is as fast as the compiled one
+_FUSED_MIN_POINTS = 50000
+
+
 # Plotting 
 def _do_scatter(ax, x: np.ndarray, y: np.ndarray, z: np.ndarray, cvals: np.ndarray, label: str) -> None:
     fig = ax.figure
     if not hasattr(ax, "name") or ax.name != "3d":
         fig.clear()
         ax = fig.add_subplot(111, projection="3d")
+    else:
+        # Reused 3D axes: drop the previous scatter and its colorbar only
+        for coll in list(ax.collections):
+            if getattr(coll, "colorbar", None) is not None:
+                coll.colorbar.remove()
+            coll.remove()
 
     sc = ax.scatter(x, y, z, c=cvals)
     fig.colorbar(sc, ax=ax, label=label)
@@ -113,11 +170,9 @@ def _do_scatter(ax, x: np.ndarray, y: np.ndarray, z: np.ndarray, cvals: np.ndarr
     ax.set_title(f"3D scatter colored by {label}")
 
 
-def plot_csv(ax, csv_path: str) -> None:
-    metric = get_metric()
-    header, data = _read_csv(csv_path)
-    theta, phi, metrics = _extract_columns(header, data)
-
+def plot_arrays(ax, theta: np.ndarray, phi: np.ndarray, metrics: dict, metric: Optional[str] = None) -> dict:
+    """Scatter already-parsed columns on ax; returns {"points", "total", "stride"} of what was drawn."""
+    metric = metric or get_metric()
     label = metric
     cvals = metrics.get(metric.upper())
     if cvals is None:
@@ -126,14 +181,49 @@ def plot_csv(ax, csv_path: str) -> None:
         else:
             raise ValueError("No recognized metric columns found.")
 
-    # Spherical to Cartesian 
-    x, y, z = _sph_to_cart(theta, phi)
-
-    # Error control
-    mask = np.isfinite(x) & np.isfinite(y) & np.isfinite(z) & np.isfinite(cvals)
-    if not np.any(mask):
-        raise ValueError("No finite data after parsing.")
-    _do_scatter(ax, x[mask], y[mask], z[mask], cvals[mask], label)
+    if _fused_pipeline is not None and theta.size >= _FUSED_MIN_POINTS:
+        x, y, z, cvals = _fused_pipeline(
+            np.ascontiguousarray(theta, dtype=np.float64),
+            np.ascontiguousarray(phi, dtype=np.float64),
+            np.ascontiguousarray(cvals, dtype=np.float64),
+        )
+        if not x.size:
+            raise ValueError("No finite data after parsing.")
+        total = x.size
+        stride = max(1, math.ceil(total / _MAX_POINTS))
+        if stride > 1:
+            x, y, z, cvals = x[::stride], y[::stride], z[::stride], cvals[::stride]
+    else:
+        # Error control: x, y, z are finite exactly where theta and phi are,
+        # so rows are dropped before the conversion
+        mask = np.isfinite(theta)
+        mask &= np.isfinite(phi)
+        mask &= np.isfinite(cvals)
+        if not np.any(mask):
+            raise ValueError("No finite data after parsing.")
+
+        theta, phi, cvals = theta[mask], phi[mask], cvals[mask]
+        total = theta.size
+        stride = max(1, math.ceil(total / _MAX_POINTS))
+        if stride > 1:
+            theta, phi, cvals = theta[::stride], phi[::stride], cvals[::stride]
+
+        # Spherical to Cartesian 
+        x, y, z = _sph_to_cart(theta, phi)
+    _do_scatter(ax, x, y, z, cvals, label)
+    return {"points": int(x.size), "total": int(total), "stride": stride}
+
+
+def plot_table(ax, header: List[str], data: np.ndarray) -> dict:
+    """plot_arrays for a header and 2D float table as mieprog prints them."""
+    theta, phi, metrics = _extract_columns(header, np.asarray(data, dtype=float))
+    return plot_arrays(ax, theta, phi, metrics)
+
+
+def plot_csv(ax, csv_path: str) -> dict:
+    """plot_table for a CSV exported by mieprog."""
+    header, data = _read_csv(csv_path)
+    return plot_table(ax, header, data)
 
 # CLI for quick testing 
 def _cli():
@@ -164,9 +254,11 @@ def _cli():
         idx = _np.random.choice(n, size=k, replace=False)
         theta, phi, cvals = theta[idx], phi[idx], cvals[idx]
 
-    x, y, z = _sph_to_cart(theta, phi)
-    mask = np.isfinite(x) & np.isfinite(y) & np.isfinite(z) & np.isfinite(cvals)
-    x, y, z, cvals = x[mask], y[mask], z[mask], cvals[mask]
+    mask = np.isfinite(theta)
+    mask &= np.isfinite(phi)
+    mask &= np.isfinite(cvals)
+    x, y, z = _sph_to_cart(theta[mask], phi[mask])
+    cvals = cvals[mask]
 
     # Plot
     fig = plt.figure(figsize=(7, 6))
@@ -1,22 +1,25 @@
 import os
-import re
 import csv
 import datetime
-import subprocess
+import itertools
+import mmap
+import warnings
 import importlib
 import importlib.util
 import sys
 import shutil
 from pathlib import Path
 
+import numpy as np
+
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QLineEdit,
     QVBoxLayout, QHBoxLayout,
-    QPushButton, QTextEdit, QGroupBox,
+    QPushButton, QTextEdit, QPlainTextEdit, QGroupBox,
     QFormLayout, QFileDialog, QComboBox,
-    QSizePolicy, QTableWidget, QTableWidgetItem, QDialog
+    QSizePolicy, QTableView, QDialog
 )
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import pyqtSignal, Qt, QProcess, QAbstractTableModel, QModelIndex
 
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
@@ -24,6 +27,118 @@ from matplotlib.figure import Figure
 scatmech_bin = str(Path.home() / "Local/ME498/SCATMECH")
 os.environ["PATH"] = scatmech_bin + os.pathsep + os.environ.get("PATH", "")
 
+# Directory of this file; rcwplot.py is looked up next to it first
+_HERE = str(Path(__file__).resolve().parent)
+
+
+def _file_mtime(path):
+    """mtime of path, 0 if it is missing or unreadable."""
+    try:
+        return os.path.getmtime(path)
+    except (OSError, TypeError):
+        return 0
+
+
+def _map_text(path):
+    """Contents of path decoded as UTF-8, read through a memory map."""
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(mm, "utf-8", "ignore")
+
+
+# Write buffer for the CSV export
+_WRITE_BUFFER = 1 << 20
+
+# Column names that mark the table header line of rcwprog output
+_HEADER_KEYS = frozenset(("order", "theta", "phi", "rs", "rp", "diff"))
+
+
+# Characters a plain float can be written with, and the words float()
+# also accepts; anything else rejects a token without a ValueError
+_NUM_TABLE = str.maketrans("", "", "0123456789+-.eE")
+_FLOAT_WORDS = frozenset(("nan", "inf", "infinity"))
+
+
+def _is_number(token):
+    """True if token parses as a float."""
+    rest = token.translate(_NUM_TABLE)
+    if rest and rest.lower() not in _FLOAT_WORDS:
+        return False
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_numeric(line):
+    """True if line is non-blank and starts with a number."""
+    parts = line.split(None, 1)
+    return bool(parts) and _is_number(parts[0])
+
+
+def _numeric_prefix(line):
+    """Floats of the leading numeric tokens of line."""
+    values = []
+    for token in line.split():
+        try:
+            values.append(float(token))
+        except ValueError:
+            break
+    return values
+
+
+def _pad_rows(rows):
+    """Return ragged token rows as a 2D object array padded with ""."""
+    lens = np.fromiter(map(len, rows), dtype=np.intp, count=len(rows))
+    table = np.full((len(rows), int(lens.max())), "", dtype=object)
+    table[np.arange(table.shape[1]) < lens[:, None]] = np.fromiter(
+        itertools.chain.from_iterable(rows), dtype=object, count=int(lens.sum()))
+    return table
+
+
+class _CSVModel(QAbstractTableModel):
+    """Read-only table model over a 2D array of CSV cell strings; the view
+    only asks for the cells it shows, so no per-cell items are built."""
+
+    def __init__(self, header, arr, parent=None):
+        super().__init__(parent)
+        self._hdr = list(header)
+        self._arr = arr
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._arr.shape[0]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._hdr)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        if index.column() >= self._arr.shape[1]:
+            return None
+        return str(self._arr[index.row(), index.column()])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._hdr[section] if section < len(self._hdr) else None
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # Text order, as QTableWidget sorted these cells
+        if not 0 <= column < self._arr.shape[1] or not len(self._arr):
+            return
+        self.layoutAboutToBeChanged.emit()
+        idx = np.argsort(self._arr[:, column].astype(str), kind="stable")
+        if order == Qt.DescendingOrder:
+            idx = idx[::-1]
+        self._arr = self._arr[idx]
+        self.layoutChanged.emit()
+
 
 _TYPE_CHOICES = [
     ("Reflection into incident medium", "0"),
@@ -50,6 +165,11 @@ class RCWForm(QWidget):
         self.figure = Figure(figsize=(6, 5), tight_layout=True)
         self.canvas = FigureCanvas(self.figure)
         self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._bg = None
+        self._bg_signature = None
+        self._blit_artists = []
+        self._ax = None
+        self.canvas.mpl_connect("draw_event", self._on_canvas_draw)
 
         plot_layout = QVBoxLayout()
         plot_layout.addWidget(self.canvas, 1)
@@ -115,12 +235,13 @@ class RCWForm(QWidget):
         self.form_layout.addWidget(ctrl_widget)
 
         self.form_layout.addWidget(QLabel("Input Deck Preview:"))
-        self.input_preview = QTextEdit()
+        self.input_preview = QPlainTextEdit()
+        self.input_preview.setLineWrapMode(QPlainTextEdit.NoWrap)
         self.input_preview.setMinimumHeight(140)
         self.form_layout.addWidget(self.input_preview)
 
         self.form_layout.addWidget(QLabel("Log:"))
-        self.log = QTextEdit()
+        self.log = QPlainTextEdit()
         self.log.setReadOnly(True)
         self.log.setMinimumHeight(140)
         self.log.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
@@ -133,11 +254,41 @@ class RCWForm(QWidget):
         self.open_input_btn.clicked.connect(self.open_last_input)
         self.browse_grating.clicked.connect(self._browse_for_grating)
 
+        # The input deck is rebuilt only after a parameter widget changes
+        self._payload_dirty = True
+        self._cached_payload = None
+        for edit in (self.order, self.wavelength_um, self.theta_inc_deg, self.rotation_deg,
+                     self.medium_i, self.medium_t, self.grating_path):
+            edit.textChanged.connect(self._mark_payload_dirty)
+        self.type_combo.currentIndexChanged.connect(self._mark_payload_dirty)
+
         self._plot_clear_callback = None
         self.last_stdout_path = None
         self.last_input_path = None
         self.last_csv_path = None
 
+        # rcwprog runs through QProcess so the GUI stays live; stdout is
+        # written to the log file and parsed from it once the process exits
+        self.proc = QProcess(self)
+        self.proc.finished.connect(self._on_rcw_finished)
+        self.proc.errorOccurred.connect(self._on_rcw_error)
+        # (stdout log, CSV) paths of the run in flight
+        self._rcw_paths = None
+
+        # Lets "import rcwplot" find the copy next to this file
+        if _HERE not in sys.path:
+            sys.path.insert(0, _HERE)
+
+        # Pending log lines while a run step is in progress
+        self._log_buffer = None
+
+        # Resolved rcwplot module, how it was found, its file and that
+        # file's mtime; reloaded only when the file changes
+        self._rcwplot_mod = None
+        self._rcwplot_how = None
+        self._rcwplot_file = None
+        self._rcwplot_mtime = 0
+
         self.populate_input_preview()
 
     def connect_plot_clear(self, slot):
@@ -149,17 +300,58 @@ class RCWForm(QWidget):
             try:
                 sig.emit()
             except Exception as exc:
-                self.log.append(f"Clear-plot signal error: {exc}")
+                self._log(f"Clear-plot signal error: {exc}")
         if callable(getattr(self, "_plot_clear_callback", None)):
             try:
                 self._plot_clear_callback()
             except Exception as exc:
-                self.log.append(f"Clear-plot callback error: {exc}")
+                self._log(f"Clear-plot callback error: {exc}")
         if hasattr(self, "figure"):
             self.figure.clear()
+        self._blit_artists = []
+        self._bg_signature = None
         if hasattr(self, "canvas"):
             self.canvas.draw()
-        self.log.append("Plot cleared.")
+        self._log("Plot cleared.")
+
+    def _plot_axes(self):
+        """Return the plot axes as rcwplot left them; recreated only after clear_plot."""
+        ax = self._ax
+        if ax is None or ax not in self.figure.axes:
+            self.figure.clear()
+            ax = self._ax = self.figure.add_subplot(111)
+        return ax
+
+    def _axes_signature(self, ax):
+        legend = ax.get_legend()
+        return (
+            tuple(self.figure.bbox.bounds),
+            # tight_layout reproduces the position only to rounding noise
+            tuple(round(v, 6) for v in ax.get_position().bounds),
+            ax.get_xlim(), ax.get_ylim(),
+            ax.get_xlabel(), ax.get_ylabel(),
+            tuple(t.get_text() for t in legend.get_texts()) if legend else (),
+        )
+
+    def _blit_or_draw(self, ax):
+        """Blit only the data lines when the axes decorations are unchanged."""
+        self._blit_artists = list(ax.get_lines())
+        for artist in self._blit_artists:
+            artist.set_animated(True)
+        if self._bg is not None and self._axes_signature(ax) == self._bg_signature:
+            self.canvas.restore_region(self._bg)
+            for artist in self._blit_artists:
+                ax.draw_artist(artist)
+            self.canvas.blit(self.figure.bbox)
+        else:
+            self.canvas.draw()
+            self._bg_signature = self._axes_signature(ax)
+
+    def _on_canvas_draw(self, event):
+        # Every full draw (first plot, resize, clear) refreshes the cached background
+        self._bg = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self._blit_artists:
+            artist.axes.draw_artist(artist)
 
     def _browse_for_grating(self):
         fname, _ = QFileDialog.getOpenFileName(self, "Select grating file", "", "All Files (*)")
@@ -168,11 +360,20 @@ class RCWForm(QWidget):
             self.populate_input_preview()
 
     def populate_input_preview(self):
-        payload = self._build_input_payload()
-        self.input_preview.setPlainText(payload)
-        self.log.append("Parameters updated.")
+        self._show_payload(self._build_input_payload())
+        self._log("Parameters updated.")
+
+    def _show_payload(self, payload):
+        # Resetting an identical document would only cost a relayout
+        if payload != self.input_preview.toPlainText():
+            self.input_preview.setPlainText(payload)
+
+    def _mark_payload_dirty(self, *_):
+        self._payload_dirty = True
 
     def _build_input_payload(self):
+        if not self._payload_dirty and self._cached_payload is not None:
+            return self._cached_payload
         order = self.order.text().strip() or "6"
         type_code = self.type_combo.currentData() or "0"
         wavelength = self.wavelength_um.text().strip() or "0.532"
@@ -193,11 +394,35 @@ class RCWForm(QWidget):
             grating,
         ]
 
-        return "\n".join(lines) + "\n"
+        self._cached_payload = "\n".join(lines) + "\n"
+        self._payload_dirty = False
+        return self._cached_payload
+
+    def _log(self, message: str):
+        if self._log_buffer is not None:
+            self._log_buffer.append(message)
+        else:
+            self.log.appendPlainText(message)
+
+    def _log_batched(self, fn, *args):
+        """Call fn with its log lines appended to the log in one update."""
+        self._log_buffer = []
+        try:
+            return fn(*args)
+        finally:
+            messages, self._log_buffer = self._log_buffer, None
+            if messages:
+                self.log.appendPlainText("\n".join(messages))
 
     def run_rcwprog(self):
+        self._log_batched(self._run_rcwprog)
+
+    def _run_rcwprog(self):
+        if self.proc.state() != QProcess.NotRunning:
+            self._log("rcwprog is already running.")
+            return
         payload = self._build_input_payload()
-        self.input_preview.setPlainText(payload)
+        self._show_payload(payload)
         self.last_csv_path = None        
 
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -208,131 +433,157 @@ class RCWForm(QWidget):
         csv_filename = os.path.join(data_dir, f"rcw_output_{timestamp}.csv")
 
         try:
+            # The saved deck is rcwprog's stdin, so it is exactly the payload
             with open(input_txt, "w", encoding="utf-8") as f:
-                f.write(payload + "\n")
+                f.write(payload)
             self.last_input_path = input_txt
-            self.log.append(f"Saved input deck: {input_txt}")
+            self._log(f"Saved input deck: {input_txt}")
         except Exception as exc:
-            self.log.append(f"[Error] Could not write input deck: {exc}")
+            self._log(f"[Error] Could not write input deck: {exc}")
             return
 
         exe = shutil.which("rcwprog")
         if not exe:
-            self.log.append(
+            self._log(
                 "[Error] 'rcwprog' not found. Ensure it is on PATH or next to the app.\n"
                 f"Current PATH includes: {scatmech_bin}"
             )
             return
 
-        self.log.append(f"Running RCWProg: {exe}")
-        try:
-            proc = subprocess.run(
-                [exe],
-                input=payload,
-                capture_output=True,
-                text=True,
-                check=False,
-                cwd=os.path.dirname(exe) if os.path.sep in exe else None,
-            )
-        except Exception as exc:
-            self.log.append(f"[Error] Could not invoke rcwprog: {exc}")
+        self._rcw_paths = (output_txt, csv_filename)
+
+        self._log(f"Running RCWProg: {exe}")
+        self.proc.setWorkingDirectory(os.path.dirname(exe) if os.path.sep in exe else "")
+        self.proc.setStandardInputFile(input_txt)
+        # stdout goes straight to the log file and is mapped back for parsing
+        self.proc.setStandardOutputFile(output_txt)
+        self.run_btn.setEnabled(False)
+        self.proc.start(exe, [])
+
+    def _end_rcw_run(self):
+        """Re-enable Run; returns the (log, CSV) paths of the finished run."""
+        paths, self._rcw_paths = self._rcw_paths, None
+        self.run_btn.setEnabled(True)
+        return paths
+
+    def _on_rcw_error(self, error):
+        # finished() is not emitted when the process could not be started
+        if error != QProcess.FailedToStart:
             return
+        output_txt, _ = self._end_rcw_run()
+        try:
+            os.remove(output_txt)
+        except OSError:
+            pass
+        self._log(f"[Error] Could not invoke rcwprog: {self.proc.errorString()}")
 
+    def _on_rcw_finished(self, exit_code, exit_status):
+        self._log_batched(self._process_rcw_output, exit_code, exit_status)
+
+    def _process_rcw_output(self, exit_code, exit_status):
+        output_txt, csv_filename = self._end_rcw_run()
         try:
-            with open(output_txt, "w", encoding="utf-8", errors="ignore") as f:
-                f.write(proc.stdout or "")
-                if proc.stderr:
-                    f.write("\n--- STDERR ---\n")
-                    f.write(proc.stderr)
+            stdout = _map_text(output_txt)
+            stderr = self.proc.readAllStandardError().data()
+            if stderr:
+                with open(output_txt, "ab") as f:
+                    f.write(b"\n--- STDERR ---\n")
+                    f.write(stderr)
             self.last_stdout_path = output_txt
-            self.log.append(f"Saved stdout log: {output_txt}")
+            self._log(f"Saved stdout log: {output_txt}")
         except Exception as exc:
-            self.log.append(f"[Warning] Failed to store stdout: {exc}")
+            self._log(f"[Warning] Failed to store stdout: {exc}")
+            stdout = ""
 
-        if proc.returncode != 0:
-            self.log.append("rcwprog returned non-zero exit code. See output log for details.")
+        if exit_status != QProcess.NormalExit or exit_code != 0:
+            self._log("rcwprog returned non-zero exit code. See output log for details.")
             return
 
-        self.log.append("rcwprog completed. Parsing output table…")
+        self._log("rcwprog completed. Parsing output table…")
 
         try:
-            header, rows = self._extract_table(proc.stdout)
+            header, rows = self._extract_table(stdout)
         except Exception as exc:
-            self.log.append(f"[Error] Failed to parse rcwprog output: {exc}")
+            self._log(f"[Error] Failed to parse rcwprog output: {exc}")
             return
 
-        if not rows:
-            self.log.append("No numeric rows detected in rcwprog output.")
+        if rows is None or not len(rows):
+            self._log("No numeric rows detected in rcwprog output.")
             return
 
         try:
-            with open(csv_filename, "w", newline="", encoding="utf-8") as fcsv:
+            # One large buffer instead of an 8 KiB flush every few rows
+            with open(csv_filename, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER) as fcsv:
                 writer = csv.writer(fcsv)
                 if header:
                     writer.writerow(header)
                 writer.writerows(rows)
-            self.log.append(f"Saved CSV: {csv_filename}")
+            self._log(f"Saved CSV: {csv_filename}")
             self.last_csv_path = csv_filename
         except Exception as exc:
-            self.log.append(f"[Error] Could not write CSV: {exc}")
+            self._log(f"[Error] Could not write CSV: {exc}")
             return
 
-        self.render_with_external(csv_filename)
+        self.render_with_external(csv_filename, table=(header, rows))
 
     def _extract_table(self, stdout: str):
+        """Return (header, table) for the numeric block of rcwprog output.
+
+        The block starts at the first numeric line after the header and ends
+        at the next blank or non-numeric line. Each row contributes its
+        numeric prefix to a float array as wide as the widest prefix, capped
+        at the header width; missing cells are nan.
+        """
         if not stdout:
-            return [], []
+            return [], None
         lines = stdout.splitlines()
         header_idx = None
         header = []
         for i, line in enumerate(lines):
-            tokens = re.split(r"\s+", line.strip())
-            if not tokens:
+            # Cheap substring test first; only candidate lines are tokenized,
+            # and a key must still be a whole token ("rs" in "Parameters"
+            # does not make a header)
+            low = line.lower()
+            if not any(key in low for key in _HEADER_KEYS):
                 continue
-            lowered = [t.lower() for t in tokens]
-            if any(key in lowered for key in ("order", "theta", "phi", "rs", "rp", "diff")):
+            if _HEADER_KEYS.intersection(low.split()):
                 header_idx = i
-                header = tokens
+                header = line.split()
                 break
-        data_rows = []
         start = header_idx + 1 if header_idx is not None else 0
-        for line in lines[start:]:
-            s = line.strip()
-            if not s:
-                if data_rows:
-                    break
-                continue
-            parts = re.split(r"\s+", s)
-            if not parts:
-                continue
-            numeric_prefix = 0
-            for token in parts:
-                try:
-                    float(token)
-                    numeric_prefix += 1
-                except Exception:
-                    break
-            if numeric_prefix == 0:
-                if data_rows:
-                    break
-                continue
-            data_rows.append(parts[:numeric_prefix])
-        if not header and data_rows:
-            width = max(len(row) for row in data_rows)
-            header = [f"col{i+1}" for i in range(width)]
+        body = itertools.dropwhile(lambda line: not _is_numeric(line), lines[start:])
+        block = list(itertools.takewhile(_is_numeric, body))
+        if not block:
+            return header, None
+        try:
+            # Rectangular all-numeric block: one numpy parse
+            table = np.loadtxt(block, dtype=float, ndmin=2)
+        except ValueError:
+            # Ragged rows or trailing text: each row keeps its numeric prefix,
+            # short rows are nan-filled to the widest prefix
+            rows = [_numeric_prefix(line) for line in block]
+            table = np.full((len(rows), max(map(len, rows))), np.nan)
+            for i, row in enumerate(rows):
+                table[i, :len(row)] = row
+        width = table.shape[1]
         if header:
-            width = min(len(header), max(len(row) for row in data_rows))
+            width = min(len(header), width)
             header = header[:width]
+            table = table[:, :width]
         else:
-            width = max(len(row) for row in data_rows)
-        trimmed = [row[:width] for row in data_rows]
-        return header, trimmed
-
-    def render_with_external(self, csv_path: str):
-        self.figure.clear()
-        ax = self.figure.gca()
-
-        here = os.path.dirname(os.path.abspath(__file__))
+            header = [f"col{i+1}" for i in range(width)]
+        return header, table
+
+    def _resolve_rcwplot(self, csv_path):
+        """Load rcwplot (cached until its file changes); False if it cannot be found."""
+        mod = self._rcwplot_mod
+        if mod is not None and _file_mtime(self._rcwplot_file) != self._rcwplot_mtime:
+            sys.modules.pop("rcwplot", None)
+            mod = None
+        if mod is not None:
+            return True
+
+        here = _HERE
         cwd = os.getcwd()
         csv_dir = os.path.dirname(os.path.abspath(csv_path)) if csv_path else None
 
@@ -359,9 +610,6 @@ class RCWForm(QWidget):
                 tried.append(f"load {path}: {exc}")
             return None, None
 
-        if here not in sys.path:
-            sys.path.insert(0, here)
-
         mod, how = _try_normal("rcwplot")
         if mod is None:
             mod, how = _try_file(os.path.join(here, "rcwplot.py"))
@@ -371,24 +619,42 @@ class RCWForm(QWidget):
             mod, how = _try_file(os.path.join(csv_dir, "rcwplot.py"))
 
         if mod is None:
-            self.log.append("Could not import rcwplot.py: " + " | ".join(tried))
+            self._log("Could not import rcwplot.py: " + " | ".join(tried))
+            return False
+
+        self._rcwplot_mod = mod
+        self._rcwplot_how = how
+        self._rcwplot_file = getattr(mod, "__file__", None)
+        self._rcwplot_mtime = _file_mtime(self._rcwplot_file)
+        return True
+
+    def render_with_external(self, csv_path: str, table=None):
+        """Plot csv_path with rcwplot; table=(header, data) plots the parsed
+        run directly instead of re-reading the CSV."""
+        ax = self._plot_axes()
+
+        if not self._resolve_rcwplot(csv_path):
             self.canvas.draw()
             return
-        else:
-            self.log.append(f"rcwplot resolved via: {how}")
+        self._log(f"rcwplot resolved via: {self._rcwplot_how}")
 
-        fn = getattr(mod, "plot_csv", None)
+        fn = getattr(self._rcwplot_mod, "plot_arrays", None)
+        if table is not None and callable(fn):
+            fn_name, args = "plot_arrays", table
+        else:
+            fn = getattr(self._rcwplot_mod, "plot_csv", None)
+            fn_name, args = "plot_csv", (csv_path,)
         if not callable(fn):
-            self.log.append("rcwplot.py found, but it must define plot_csv(ax, csv_path).")
+            self._log("rcwplot.py found, but it must define plot_csv(ax, csv_path).")
             self.canvas.draw()
             return
 
         try:
-            fn(ax, csv_path)
-            self.canvas.draw()
-            self.log.append("Plot updated via rcwplot.plot_csv")
+            fn(ax, *args)
+            self._blit_or_draw(ax)
+            self._log(f"Plot updated via rcwplot.{fn_name}")
         except Exception as exc:
-            self.log.append(f"rcwplot render error: {exc}")
+            self._log(f"rcwplot render error: {exc}")
             self.canvas.draw()
 
     def open_last_output(self):
@@ -397,7 +663,7 @@ class RCWForm(QWidget):
         if not path or not os.path.exists(path):
             path = self._find_latest("rcw_output_", data_dir, suffix=".csv")
         if not path:
-            self.log.append("No RCW CSV output found in ../DATA.")
+            self._log("No RCW CSV output found in ../DATA.")
             return
 
         dlg = QDialog(self)
@@ -409,7 +675,7 @@ class RCWForm(QWidget):
         txt.setMinimumHeight(120)
         layout.addWidget(txt)
 
-        table = QTableWidget(dlg)
+        table = QTableView(dlg)
         table.setMinimumHeight(320)
         layout.addWidget(table)
 
@@ -422,28 +688,33 @@ class RCWForm(QWidget):
 
         try:
             with open(path, newline="") as f:
-                rows = list(csv.reader(f))
-            if not rows:
+                header = next(csv.reader(f), None)
+                if header is not None:
+                    try:
+                        with warnings.catch_warnings():
+                            warnings.simplefilter("ignore")
+                            data = np.loadtxt(f, delimiter=",", dtype=str, comments=None, ndmin=2)
+                    except ValueError:
+                        # Ragged rows: pad them out cell by cell
+                        f.seek(0)
+                        rows = list(csv.reader(f))[1:]
+                        data = _pad_rows(rows) if rows else np.empty((0, 0), dtype=object)
+            if header is None:
                 txt.setPlainText("(Empty CSV)")
             else:
-                header, data = rows[0], rows[1:]
-                table.setColumnCount(len(header))
-                table.setRowCount(len(data))
-                table.setHorizontalHeaderLabels(header)
-                for r, row in enumerate(data):
-                    for c, val in enumerate(row):
-                        table.setItem(r, c, QTableWidgetItem(val))
+                table.setModel(_CSVModel(header, data, table))
+                # Rows start in file order; clicking a header sorts
+                table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
                 table.setSortingEnabled(True)
                 table.resizeColumnsToContents()
                 txt_path = getattr(self, "last_stdout_path", None)
                 if txt_path and os.path.exists(txt_path):
                     txt.setPlainText(self._read_file(txt_path))
-                    
                 else:
                     txt.setPlainText("(Stdout log not available)")
         except Exception as exc:
             txt.setPlainText(f"(Failed to open CSV: {exc})")
-                    
+
         dlg.resize(900, 700)
         dlg.exec_()
 
@@ -453,7 +724,7 @@ class RCWForm(QWidget):
         if not path or not os.path.exists(path):
             path = self._find_latest("rcw_input_", data_dir)
         if not path:
-            self.log.append("No RCW input deck found in ../DATA.")
+            self._log("No RCW input deck found in ../DATA.")
             return
         content = self._read_file(path)
         dlg = QDialog(self)
@@ -473,19 +744,13 @@ class RCWForm(QWidget):
         dlg.exec_()
 
     def _find_latest(self, prefix: str, folder: str, suffix: str = ""):
+        # DirEntry caches its stat result, so each candidate is stat'ed once
         try:
-            paths = [
-                os.path.join(folder, f)
-                for f in os.listdir(folder)
-                if f.startswith(prefix) and f.endswith(suffix)
-            ] if suffix else [
-                os.path.join(folder, f)
-                for f in os.listdir(folder)
-                if f.startswith(prefix)
-            ]
-            if not paths:
+            with os.scandir(folder) as it:
+                entries = [e for e in it if e.name.startswith(prefix) and e.name.endswith(suffix)]
+            if not entries:
                 return None
-            return max(paths, key=lambda p: os.path.getmtime(p))
+            return max(entries, key=lambda e: e.stat().st_mtime).path
         except Exception:
             return None
 
@@ -4,23 +4,38 @@ from pathlib import Path
 from typing import List, Tuple
 
 import csv
+import warnings
+
 import numpy as np
 from matplotlib.ticker import AutoMinorLocator, MultipleLocator
 
 
-def _read_csv(csv_path: str) -> Tuple[List[str], List[List[str]]]:
+def _read_csv(csv_path: str) -> Tuple[List[str], np.ndarray]:
     path = Path(csv_path)
     if not path.exists():
         raise FileNotFoundError(f"CSV not found: {csv_path}")
     with open(path, newline="") as f:
-        rows = [row for row in csv.reader(f) if any(cell.strip() for cell in row)]
-
-    if not rows:
-        raise ValueError(f"CSV appears empty: {csv_path}")
-
-    header = rows[0]
-    data = rows[1:] if len(rows) > 1 else []
-    if not data:
+        header = next((row for row in csv.reader(f) if any(cell.strip() for cell in row)), None)
+        if header is None:
+            raise ValueError(f"CSV appears empty: {csv_path}")
+        # Whole table in one numpy pass; missing or non-numeric cells are NaN
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                data = np.genfromtxt(f, delimiter=",", dtype=float, filling_values=np.nan, ndmin=2)
+        except ValueError:
+            # Ragged rows: convert cell by cell, padding short rows with NaN
+            f.seek(0)
+            rows = [row for row in csv.reader(f) if any(cell.strip() for cell in row)][1:]
+            data = np.full((len(rows), max(map(len, rows), default=0)), np.nan)
+            for i, row in enumerate(rows):
+                for j, cell in enumerate(row):
+                    try:
+                        data[i, j] = float(cell)
+                    except ValueError:
+                        pass
+
+    if not len(data):
         raise ValueError("CSV contains header but no data rows.")
 
     return header, data
@@ -34,23 +49,26 @@ def _column_by_hint(header: List[str], hints: List[str]) -> int:
     return -1
 
 
-def _to_float(values: List[str]) -> np.ndarray:
-    out: List[float] = []
-    for val in values:
-        try:
-            out.append(float(val))
-        except Exception:
-            out.append(float("nan"))
-    return np.asarray(out, dtype=float)
+def _column(data: np.ndarray, idx: int) -> np.ndarray:
+    """Column idx of data, all NaN if the table is narrower than that."""
+    if idx < data.shape[1]:
+        return data[:, idx]
+    return np.full(len(data), np.nan)
 
-def plot_csv(ax, csv_path: str) -> None:
 
+def plot_csv(ax, csv_path: str) -> None:
+   """plot_arrays for a CSV written by the RCW form."""
    header, data = _read_csv(csv_path)
+   plot_arrays(ax, header, data)
+
 
+def plot_arrays(ax, header: List[str], data: np.ndarray) -> None:
+   """Plot each value column of a 2D float table against the order column."""
+   data = np.asarray(data, dtype=float)
    order_idx = _column_by_hint(header, ["order", "m", "index"])
    if order_idx < 0:
         order_idx = 0
-   x_vals = _to_float([row[order_idx] if order_idx < len(row) else "" for row in data])
+   x_vals = _column(data, order_idx)
     
    candidate_hints = ["diff", "eff", "rs", "rp", "s11", "intensity", "power"]
    y_indices: List[int] = []
@@ -65,28 +83,42 @@ def plot_csv(ax, csv_path: str) -> None:
 
    if not y_indices:
         raise ValueError("No value columns detected for plotting.")
-   ax.cla()
-   plotted = 0
+   curves = []
    for idx in y_indices:
-        series = _to_float([row[idx] if idx < len(row) else "" for row in data])
+        series = _column(data, idx)
         mask = np.isfinite(x_vals) & np.isfinite(series)
         if not np.any(mask):
             continue
         label = header[idx].strip() or f"col{idx+1}"
-        ax.plot(x_vals[mask], series[mask], marker="o", label=label)
-        plotted += 1
+        curves.append((label, x_vals[mask], series[mask]))
 
-   if plotted == 0:
+   if not curves:
+        ax.cla()
         raise ValueError("Parsed CSV but found no plottable numeric data.")
 
    xlabel = header[order_idx].strip() or "Diffraction Order"
+   lines = ax.get_lines()
+   if ax.get_xlabel() == xlabel and [line.get_label() for line in lines] == [c[0] for c in curves]:
+        # Same columns as the plot already on ax: move the data and keep
+        # the lines, locators, grid and legend
+        for line, (_, x, y) in zip(lines, curves):
+            line.set_data(x, y)
+        ax.relim()
+        ax.autoscale_view()
+        ax.figure.tight_layout()
+        return
+
+   ax.cla()
+   for label, x, y in curves:
+        ax.plot(x, y, marker="o", label=label)
+
    ax.set_xlabel(xlabel)
    ax.set_ylabel("Value")
    ax.xaxis.set_major_locator(MultipleLocator(1))
    ax.xaxis.set_minor_locator(AutoMinorLocator(2))
    ax.grid(True, which="major", linewidth=0.8, alpha=0.6)
    ax.grid(True, which="minor", linewidth=0.4, alpha=0.35)
-   if plotted > 1:
+   if len(curves) > 1:
         ax.legend(loc="best")
 
    ax.figure.tight_layout()
\ No newline at end of file
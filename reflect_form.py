@@ -1,12 +1,17 @@
 import os
 import csv
+import contextlib
 import re
 import datetime
+import functools
 import subprocess
+import tempfile
 import importlib, importlib.util, sys
 import shutil
 from pathlib import Path
 
+import numpy as np
+
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QLineEdit,
     QVBoxLayout, QHBoxLayout,
@@ -16,14 +21,24 @@ from PyQt5.QtWidgets import (
     QTableWidget, QTableWidgetItem,
     QSizePolicy, QMessageBox
 )
+from PyQt5.QtCore import pyqtSignal, QObject, QRunnable, QThreadPool, QUrl
+from PyQt5.QtGui import QDesktopServices
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
 scatmech_bin = str(Path.home() / "Local/ME498/SCATMECH")
 os.environ["PATH"] = scatmech_bin + os.pathsep + os.environ.get("PATH", "")
 
+_HERE = Path(__file__).resolve().parent
+
 _NK_RE = re.compile(r"^\s*\(?\s*([+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)\s*,\s*([+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)\s*\)?\s*$")
 
+# A stdout line made only of numbers, signs and blanks is a data row
+_NUM_LINE_RE = re.compile(r"[0-9.eE+\- \t]+", re.ASCII)
+# The whole character-class test runs inside the regex engine; a NumPy
+# lookup table per line costs more in array setup than it saves
+_is_numeric_line = _NUM_LINE_RE.fullmatch
+
 def _parse_nk(text: str):
     m = _NK_RE.match(text or "")
     if not m:
@@ -32,6 +47,19 @@ def _parse_nk(text: str):
     k = float(m.group(2))
     return n, k
 
+def _file_mtime(path):
+    """mtime of path, 0 if it is missing or unreadable."""
+    try:
+        return os.path.getmtime(path)
+    except (OSError, TypeError):
+        return 0
+
+# Stack rows rarely change between runs, so their parses are kept
+@functools.lru_cache(maxsize=256)
+def _parse_nk_cached(text: str):
+    return _parse_nk(text)
+
+@functools.lru_cache(maxsize=256)
 def _is_float(s: str) -> bool:
     try:
         float(s)
@@ -40,6 +68,99 @@ def _is_float(s: str) -> bool:
         return False
 
 
+def _open_native(path):
+    """Open path in the platform's default application without blocking."""
+    QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+
+
+class WorkerSignals(QObject):
+    # {"returncode", "stderr", "stdout_path", "csv_path", "data"}; the
+    # paths are None when the file was not written, data is None when
+    # numpy could not parse the rows
+    finished = pyqtSignal(dict)
+    # error message when the process could not be run
+    failed = pyqtSignal(str)
+
+
+class ReflectWorker(QRunnable):
+    """Run reflectprog off the GUI thread, then save its stdout and the
+    numeric rows as CSV."""
+
+    def __init__(self, exe, stdin_payload, stdout_path, csv_path):
+        super().__init__()
+        self.exe = exe
+        self.stdin_payload = stdin_payload
+        self.stdout_path = stdout_path
+        self.csv_path = csv_path
+        self.signals = WorkerSignals()
+
+    def run(self):
+        # stdout is filtered line by line as reflectprog prints it; stderr
+        # goes to a spool file so a chatty stderr cannot stall the pipe
+        data_lines = []
+        try:
+            with tempfile.TemporaryFile("w+", encoding="utf-8", errors="replace") as errf, \
+                    open(self.stdout_path, "w", encoding="utf-8") as f, \
+                    open(self.csv_path, "w", newline="", encoding="utf-8") as csvfile:
+                with subprocess.Popen([self.exe], stdin=subprocess.PIPE,
+                                      stdout=subprocess.PIPE, stderr=errf,
+                                      text=True, encoding="utf-8", errors="replace",
+                                      bufsize=1 << 16) as proc:
+                    proc.stdin.write(self.stdin_payload)
+                    proc.stdin.close()
+                    csv.writer(csvfile).writerows(
+                        ln.split() for ln in self._data_lines(proc.stdout, f, data_lines))
+                returncode = proc.returncode
+                errf.seek(0)
+                stderr = errf.read()
+        except Exception as e:
+            self._discard(self.stdout_path, self.csv_path)
+            self.signals.failed.emit(f"[Error] Could not invoke reflectprog: {e}")
+            return
+
+        out = {"returncode": returncode, "stderr": stderr,
+               "stdout_path": None, "csv_path": None, "data": None}
+        if returncode != 0:
+            # A failed run leaves no output files behind
+            self._discard(self.stdout_path, self.csv_path)
+            self.signals.finished.emit(out)
+            return
+
+        out["stdout_path"] = self.stdout_path
+        if data_lines:
+            out["csv_path"] = self.csv_path
+
+            # The same rows as one array, so the plot needs no second read;
+            # rows numpy cannot take leave the plot to read the CSV
+            try:
+                out["data"] = np.loadtxt(data_lines, ndmin=2)
+            except ValueError:
+                pass
+        else:
+            self._discard(self.csv_path)
+        self.signals.finished.emit(out)
+
+    @staticmethod
+    def _data_lines(stream, log, kept):
+        """Copy stream to log and yield its stripped numeric lines, also
+        collecting them in kept."""
+        match = _is_numeric_line
+        for ln in stream:
+            log.write(ln)
+            ln = ln.strip()
+            if ln and match(ln):
+                kept.append(ln)
+                yield ln
+
+    @staticmethod
+    def _discard(*paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
 class ReflectForm(QWidget):
 
     def __init__(self):
@@ -57,6 +178,10 @@ class ReflectForm(QWidget):
         self.figure = Figure(figsize=(5.6, 3.4), tight_layout=True)
         self.canvas = FigureCanvas(self.figure)
         self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._bg = None
+        self._bg_signature = None
+        self._blit_artists = []
+        self.canvas.mpl_connect("draw_event", self._on_canvas_draw)
 
         self.main_layout.addWidget(form_widget, 0)
         self.main_layout.addWidget(self.canvas, 1)
@@ -150,12 +275,36 @@ class ReflectForm(QWidget):
         # State
         self.last_stdout_path = None
         self.last_input_path = None
+        # ReflectWorker of the run in flight, None when idle
+        self._worker = None
+        # reflectprog's path, looked up on the first run and again only
+        # when the file disappears
+        self._reflect_exe = None
+        # Resolved reflectplot module, how it was found, its file and that
+        # file's mtime; reloaded only when the file changes
+        self._reflectplot_mod = None
+        self._reflectplot_how = None
+        self._reflectplot_file = None
+        self._reflectplot_mtime = 0
 
         # Demo layer
-        self._add_layer(default_material="(1.50,0.00)", default_thickness="0.100000")
+        with self._bulk():
+            self._add_layer(default_material="(1.50,0.00)", default_thickness="0.100000")
 
 
     # Stack table
+    @contextlib.contextmanager
+    def _bulk(self):
+        """Hold repaints and item signals of the layer table until the block ends."""
+        self.tbl.setUpdatesEnabled(False)
+        self.tbl.blockSignals(True)
+        try:
+            yield
+        finally:
+            self.tbl.blockSignals(False)
+            self.tbl.setUpdatesEnabled(True)
+            self.tbl.viewport().update()
+
     def _add_layer(self, default_material=None, default_thickness=None):
         r = self.tbl.rowCount()
         self.tbl.insertRow(r)
@@ -176,27 +325,63 @@ class ReflectForm(QWidget):
         new_r = r + direction
         if not (0 <= new_r < self.tbl.rowCount()):
             return
-        row_vals = [self.tbl.item(r, c).text() if self.tbl.item(r, c) else "" for c in range(2)]
-        self.tbl.removeRow(r)
-        self.tbl.insertRow(new_r)
-        self.tbl.setItem(new_r, 0, QTableWidgetItem(row_vals[0]))
-        self.tbl.setItem(new_r, 1, QTableWidgetItem(row_vals[1]))
+        # Swap the existing items between the two rows instead of
+        # removing and re-inserting a row
+        with self._bulk():
+            for c in range(self.tbl.columnCount()):
+                a = self.tbl.takeItem(r, c) or QTableWidgetItem("")
+                b = self.tbl.takeItem(new_r, c) or QTableWidgetItem("")
+                self.tbl.setItem(r, c, b)
+                self.tbl.setItem(new_r, c, a)
         self.tbl.selectRow(new_r)
 
     # Basic actions 
     def clear_plot(self):
         self.figure.clear()
-        self.canvas.draw()
+        self._blit_artists = []
+        self._bg_signature = None
+        self.canvas.draw_idle()
+
+    def _axes_signature(self, ax):
+        legend = ax.get_legend()
+        return (
+            tuple(self.figure.bbox.bounds),
+            # tight_layout reproduces the position only to rounding noise
+            tuple(round(v, 6) for v in ax.get_position().bounds),
+            ax.get_xlim(), ax.get_ylim(), ax.get_yscale(),
+            ax.get_xlabel(), ax.get_ylabel(),
+            tuple(t.get_text() for t in legend.get_texts()) if legend else (),
+        )
+
+    def _blit_or_draw(self, ax):
+        """Blit only the reflectance line when the axes decorations are unchanged."""
+        self._blit_artists = list(ax.get_lines())
+        for artist in self._blit_artists:
+            artist.set_animated(True)
+        if self._bg is not None and self._axes_signature(ax) == self._bg_signature:
+            self.canvas.restore_region(self._bg)
+            for artist in self._blit_artists:
+                ax.draw_artist(artist)
+            self.canvas.blit(self.figure.bbox)
+        else:
+            self.canvas.draw()
+            self._bg_signature = self._axes_signature(ax)
+
+    def _on_canvas_draw(self, event):
+        # Every full draw (first plot, resize, clear) refreshes the cached background
+        self._bg = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self._blit_artists:
+            artist.axes.draw_artist(artist)
 
     def open_last_output(self):
         if self.last_stdout_path and os.path.exists(self.last_stdout_path):
-            os.system(f'open "{self.last_stdout_path}"')
+            _open_native(self.last_stdout_path)
         else:
             self.output_box.append("No output to open.")
 
     def open_last_input(self):
         if self.last_input_path and os.path.exists(self.last_input_path):
-            os.system(f'open "{self.last_input_path}"')
+            _open_native(self.last_input_path)
         else:
             self.output_box.append("No input file to open.")
 
@@ -207,39 +392,63 @@ class ReflectForm(QWidget):
         if not _is_float(wl_txt):
             raise ValueError("Wavelength must be a number in µm, e.g. 0.633")
 
-        # Substrate (n,k) 
-        n, k = _parse_nk(f"({self.sub_n.text().strip()},{self.sub_k.text().strip()})")
+        # Substrate (n,k): each field is checked on its own and passed through as typed
+        n_txt = self.sub_n.text().strip()
+        k_txt = self.sub_k.text().strip()
+        if not (_is_float(n_txt) and _is_float(k_txt)):
+            raise ValueError("Substrate n and k must be numbers, e.g. 1.5 and 0")
 
         # Build layer list
         layer_pairs = []
+        append = layer_pairs.append
+        item = self.tbl.item
+        thk_rows = []
+        thk_texts = []
         for r in range(self.tbl.rowCount()):
-            mat_txt = (self.tbl.item(r, 0).text() if self.tbl.item(r, 0) else "").strip()
-            thk_txt = (self.tbl.item(r, 1).text() if self.tbl.item(r, 1) else "").strip()
+            mat_item = item(r, 0)
+            thk_item = item(r, 1)
+            mat_txt = mat_item.text().strip() if mat_item else ""
+            thk_txt = thk_item.text().strip() if thk_item else ""
             if not mat_txt and not thk_txt:
                 continue
-            _parse_nk(mat_txt)  # validates (n,k)
-            if not _is_float(thk_txt):
-                raise ValueError(f"Thickness must be numeric at row {r+1}.")
-            layer_pairs.extend([mat_txt, thk_txt])
+            _parse_nk_cached(mat_txt)  # validates (n,k)
+            thk_rows.append(r)
+            thk_texts.append(thk_txt)
+            append(mat_txt)
+            append(thk_txt)
+
+        # All thicknesses in one conversion; rows are checked one by one only
+        # to name the bad one
+        try:
+            np.array(thk_texts, dtype=float)
+        except ValueError:
+            for r, thk_txt in zip(thk_rows, thk_texts):
+                try:
+                    np.array(thk_txt, dtype=float)
+                except ValueError:
+                    raise ValueError(f"Thickness must be numeric at row {r+1}.") from None
 
         lines = []
         lines.append(wl_txt)              # wavelength
-        lines.append(f"({n},{k})")       # substrate (n,k)
+        lines.append(f"({n_txt},{k_txt})")  # substrate (n,k)
         lines.append(" ".join(layer_pairs) if layer_pairs else "")  # stack
         lines.append("")                  # end of stack
         return lines
 
     # External plot 
-    def render_with_external(self, csv_path: str, y_idx: int):
-        self.figure.clear()
-        ax = self.figure.gca()
+    def _resolve_reflectplot(self, csv_path):
+        """Load reflectplot (cached until its file changes); False if it cannot be found."""
+        mod = self._reflectplot_mod
+        if mod is not None and _file_mtime(self._reflectplot_file) != self._reflectplot_mtime:
+            sys.modules.pop("reflectplot", None)
+            mod = None
+        if mod is not None:
+            return True
 
-        here = Path(__file__).resolve().parent
         cwd = Path(os.getcwd())
         csv_dir = Path(csv_path).resolve().parent if csv_path else None
 
         tried = []
-        mod = None
         how = None
 
         def _try_import(name):
@@ -268,34 +477,54 @@ class ReflectForm(QWidget):
             return False
 
         if not _try_import("reflectplot"):
-            if not _try_path(here / "reflectplot.py"):
+            if not _try_path(_HERE / "reflectplot.py"):
                 if not _try_path(cwd / "reflectplot.py") and csv_dir:
                     _try_path(csv_dir / "reflectplot.py")
 
         if mod is None:
             self.output_box.append("Could not import reflectplot.py: " + " | ".join(tried))
-            self.canvas.draw()
+            return False
+
+        self._reflectplot_mod = mod
+        self._reflectplot_how = how
+        self._reflectplot_file = getattr(mod, "__file__", None)
+        self._reflectplot_mtime = _file_mtime(self._reflectplot_file)
+        return True
+
+    def render_with_external(self, csv_path: str, y_idx: int, data=None):
+        """Plot column y_idx of csv_path with reflectplot; data, the parsed
+        table, is plotted directly instead of re-reading the CSV."""
+        # The axes are kept between runs so plot_csv can move the new data
+        # into the existing line
+        ax = self.figure.gca()
+
+        if not self._resolve_reflectplot(csv_path):
+            self.clear_plot()
             return
-        else:
-            self.output_box.append(f"reflectplot resolved via: {how}")
+        self.output_box.append(f"reflectplot resolved via: {self._reflectplot_how}")
+        mod = self._reflectplot_mod
 
         fn = getattr(mod, "plot_csv", None)
         if not callable(fn):
             self.output_box.append("reflectplot.py found, but it must define plot_csv(ax, csv_path, ...).")
-            self.canvas.draw()
+            self.clear_plot()
             return
 
         try:
             label = "Rp" if y_idx == 1 else ("Rs" if y_idx == 2 else None)
-            fn(ax, csv_path, x_col=0, y_col=y_idx, semilogy=False, label=label)
-            self.canvas.draw()
+            kwargs = {} if data is None else {"data": data}
+            fn(ax, csv_path, x_col=0, y_col=y_idx, semilogy=False, label=label, **kwargs)
+            self._blit_or_draw(ax)
             self.output_box.append("Plot updated via reflectplot.plot_csv")
         except Exception as e:
             self.output_box.append(f"reflectplot render error: {e}")
-            self.canvas.draw()
+            self.clear_plot()
 
     # Run reflectprog, save outputs, and plot
     def run_reflectprog(self):
+        if self._worker is not None:
+            self.output_box.append("reflectprog is already running.")
+            return
         try:
             input_lines = self._build_input_lines()
         except Exception as e:
@@ -309,12 +538,15 @@ class ReflectForm(QWidget):
         output_filename = os.path.join(data_dir, f"reflect_output_{timestamp}.txt")
         csv_filename = os.path.join(data_dir, f"reflect_output_{timestamp}.csv")
 
+        # One string serves both the saved input file and reflectprog's stdin
+        payload = "\n".join(input_lines) + "\n"
         with open(input_filename, "w", encoding="utf-8") as f:
-            for ln in input_lines:
-                f.write(ln + "\n")
+            f.write(payload)
         self.last_input_path = input_filename
 
-        exe = shutil.which("reflectprog")
+        exe = self._reflect_exe
+        if not (exe and os.path.exists(exe)):
+            exe = self._reflect_exe = shutil.which("reflectprog")
         if not exe:
             self.output_box.setText(
                 "[Error] 'reflectprog' not found. Ensure it is on PATH or next to the app.\n"
@@ -322,39 +554,35 @@ class ReflectForm(QWidget):
             )
             return
 
-        try:
-            result = subprocess.run(
-                [exe],
-                input="\n".join(input_lines),
-                text=True,
-                capture_output=True,
-                check=False
-            )
-        except Exception as e:
-            self.output_box.setText(f"[Error] Could not invoke reflectprog: {e}")
-            return
-
-        if result.returncode != 0:
-            self.output_box.setText(f"[Error] reflectprog failed:\n{result.stderr}")
+        worker = ReflectWorker(exe, payload, output_filename, csv_filename)
+        worker.signals.finished.connect(self._on_reflectprog_done)
+        worker.signals.failed.connect(self._on_reflectprog_failed)
+        self._worker = worker
+        self.run_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(worker)
+
+    def _finish_worker(self):
+        self._worker = None
+        self.run_btn.setEnabled(True)
+
+    def _on_reflectprog_failed(self, message):
+        self._finish_worker()
+        self.output_box.setText(message)
+
+    def _on_reflectprog_done(self, result):
+        """Report a finished reflectprog run and plot its table."""
+        self._finish_worker()
+        if result["returncode"] != 0:
+            self.output_box.setText(f"[Error] reflectprog failed:\n{result['stderr']}")
             return
 
-        with open(output_filename, "w", encoding="utf-8") as f:
-            f.write(result.stdout)
-        self.last_stdout_path = output_filename
+        self.last_stdout_path = result["stdout_path"]
         self.output_box.append("reflectprog completed. Parsing output table…")
 
-        # Parse numeric lines to CSV
-        lines = result.stdout.strip().split("\n")
-        data_lines = [ln for ln in lines if ln and all(c in "0123456789.eE+- \t" for c in ln)]
-        if data_lines:
-            with open(csv_filename, "w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.writer(csvfile)
-                for ln in data_lines:
-                    writer.writerow(ln.split())
-            self.output_box.append(f"Saved CSV: {csv_filename}")
-
+        if result["csv_path"]:
+            self.output_box.append(f"Saved CSV: {result['csv_path']}")
             y_idx = 1 if self.plot_column.currentText().startswith("R_p") else 2
-            self.render_with_external(csv_filename, y_idx)
+            self.render_with_external(result["csv_path"], y_idx, data=result["data"])
         else:
             self.output_box.append("[Warn] No numeric data lines found in stdout.")
             self.clear_plot()
@@ -1,11 +1,28 @@
 from __future__ import annotations
 import csv
+import functools
+import os
+import warnings
+
 import numpy as np
 import matplotlib.pyplot as plt
 
 
 def _read_numeric_csv(path: str) -> np.ndarray:
     """Read whitespace- or comma-separated numeric CSV into ndarray."""
+    # Clean files go through numpy's parser, comma-separated first as the
+    # form writes them; anything else is read row by row below
+    for delimiter in (",", None):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                data = np.loadtxt(path, delimiter=delimiter, ndmin=2, encoding="utf-8")
+        except ValueError:
+            continue
+        if not data.size:
+            raise ValueError("No numeric rows found in file.")
+        return data
+
     rows = []
     with open(path, "r", encoding="utf-8") as f:
         rdr = csv.reader(f)
@@ -22,9 +39,36 @@ def _read_numeric_csv(path: str) -> np.ndarray:
     return np.array(rows, dtype=float)
 
 
+@functools.lru_cache(maxsize=32)
+def _read_cached(path: str, mtime_ns: int, size: int) -> np.ndarray:
+    data = _read_numeric_csv(path)
+    # Shared by every caller that hits the cache
+    data.setflags(write=False)
+    return data
+
+
+def _load(path: str) -> np.ndarray:
+    """_read_numeric_csv, cached until the file is rewritten."""
+    st = os.stat(path)
+    return _read_cached(path, st.st_mtime_ns, st.st_size)
+
+
+def _update_line(ax, x, y, label, semilogy: bool, xlabel: str) -> bool:
+    """Move x, y into the single line already on ax when it shows the same
+    curve on the same axis type; returns False when ax must be rebuilt."""
+    lines = ax.get_lines()
+    if (len(lines) != 1 or lines[0].get_label() != label or ax.get_xlabel() != xlabel
+            or (ax.get_yscale() == "log") != semilogy):
+        return False
+    lines[0].set_data(x, y)
+    ax.relim()
+    ax.autoscale_view()
+    return True
+
+
 def plot_reflectance(ax, csv_path: str, component: str = "p", semilogy: bool = False):
   
-    data = _read_numeric_csv(csv_path)
+    data = _load(csv_path)
     if data.shape[1] < 3:
         raise ValueError("Expected at least 3 columns: θ, R_p, R_s")
 
@@ -32,14 +76,16 @@ def plot_reflectance(ax, csv_path: str, component: str = "p", semilogy: bool = F
     Rp = data[:, 1]
     Rs = data[:, 2]
 
-    ax.cla()
     if component.lower().startswith("p"):
         y = Rp
         label = "Rp (p-polarized)"
     else:
         y = Rs
         label = "Rs (s-polarized)"
+    if _update_line(ax, theta, y, label, semilogy, "Incidence angle θ (deg)"):
+        return
 
+    ax.cla()
     if semilogy:
         ax.semilogy(theta, y, label=label)
     else:
@@ -50,15 +96,23 @@ def plot_reflectance(ax, csv_path: str, component: str = "p", semilogy: bool = F
     ax.grid(True, alpha=0.3)
     ax.legend(loc="best")
 
-def plot_csv(ax, csv_path: str, x_col: int = 0, y_col: int = 1, semilogy: bool = False, label: str | None = None):
-    
-    data = _read_numeric_csv(csv_path)
+def plot_csv(ax, csv_path: str | None = None, x_col: int = 0, y_col: int = 1, semilogy: bool = False,
+             label: str | None = None, data: np.ndarray | None = None):
+    """Plot column y_col against x_col of csv_path, or of data (an already
+    parsed 2D table) when given; csv_path is not read at all then."""
+    if data is None:
+        if csv_path is None:
+            raise ValueError("plot_csv needs csv_path or data.")
+        data = _load(csv_path)
     ncols = data.shape[1]
     if max(x_col, y_col) >= ncols:
         raise ValueError(f"CSV has {ncols} columns; need at least {max(x_col, y_col)+1}.")
 
     x = data[:, x_col]
     y = data[:, y_col]
+    xlabel = "Incidence angle θ (deg)" if x_col == 0 else "X"
+    if _update_line(ax, x, y, label, semilogy, xlabel):
+        return
 
     ax.cla()
     if semilogy:
@@ -66,7 +120,7 @@ def plot_csv(ax, csv_path: str, x_col: int = 0, y_col: int = 1, semilogy: bool =
     else:
         ax.plot(x, y, label=label)
 
-    ax.set_xlabel("Incidence angle θ (deg)" if x_col == 0 else "X")
+    ax.set_xlabel(xlabel)
     if label in ("Rp", "Rs"):
         ax.set_ylabel("Reflectance")
     else: